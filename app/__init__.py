@@ -31,6 +31,16 @@ def create_app(config_class=Config):
     migrate.init_app(app, db)
     jwt.init_app(app)
 
+    from app.utils.compression_utils import compress_response
+
+    app.after_request(compress_response)
+
+    if app.config["SLOW_QUERY_LOG"]:
+        from app.utils.query_log_utils import install_query_log
+
+        with app.app_context():
+            install_query_log(app, db.engine)
+
     from app.auth import auth_bp
 
     app.register_blueprint(auth_bp, url_prefix="/auth")
@@ -39,4 +49,8 @@ def create_app(config_class=Config):
 
     app.register_blueprint(main_bp, url_prefix="/user")
 
+    from app.commands import register_commands
+
+    register_commands(app)
+
     return app
@@ -2,9 +2,10 @@ import sys
 
 sys.dont_write_bytecode = True
 
-from flask import request, jsonify
+from flask import current_app, request, jsonify
 from app.models.user import User
-from app.utils.jwt_utils import generate_token
+from app.utils.jwt_utils import admin_required, generate_token
+from app.utils.provisioning_utils import provision_users
 from app import db
 from app.auth import auth_bp
 
@@ -44,6 +45,45 @@ def register():
     return jsonify({"message": "User registered successfully"}), 201
 
 
+@auth_bp.route("/register/bulk", methods=["POST"])
+@admin_required
+def bulk_register():
+    """
+    Register many users at once. Requires the admin API key in the X-Admin-Key header.
+
+    Expects a JSON payload with the following field:
+        - users (list): Objects with the username, email and password of each user.
+
+    Rows that cannot be created, because fields are missing or the username
+    or email is taken or repeated in the request, are reported by their index
+    in the list; the other rows are still created. Passwords are hashed on
+    the request thread, so requests are capped at BULK_REGISTER_MAX_USERS;
+    larger imports go through the ``bulk-register`` command.
+
+    Returns:
+        A JSON response with the number of users created and the per-row conflicts,
+        or an error message.
+    """
+    data = request.get_json(silent=True) or {}
+    users = data.get("users")
+
+    if not isinstance(users, list) or not users:
+        return jsonify({"error": "users must be a non-empty list"}), 400
+
+    max_users = current_app.config["BULK_REGISTER_MAX_USERS"]
+    if len(users) > max_users:
+        return jsonify({"error": f"At most {max_users} users per request"}), 400
+
+    result = provision_users(
+        users,
+        batch_size=current_app.config["BULK_REGISTER_BATCH_SIZE"],
+        # Forking a process pool from a web worker is unsafe
+        workers=1,
+    )
+
+    return jsonify(result), 201 if result["created"] else 200
+
+
 @auth_bp.route("/login", methods=["POST"])
 def login():
     """
@@ -0,0 +1,241 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import click
+import csv
+import time
+from datetime import date
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app import db
+from app.models.user import User
+from app.utils.archive_utils import archive_closed_months, compact_database
+from app.utils.export_utils import write_partitioned_parquet
+from app.utils.intake_utils import add_months, iter_dataset_intakes
+from app.utils.provisioning_utils import provision_users
+from app.utils.query_log_utils import read_query_stats, reset_query_stats
+from app.utils.seed_utils import HISTORY_DISTRIBUTIONS, seed_charts, seed_dataset
+
+
+@click.command("export-parquet")
+@click.argument("output_dir", type=click.Path(file_okay=False))
+@click.option(
+    "--row-group-size",
+    type=int,
+    default=None,
+    help="Rows per row group (defaults to PARQUET_ROW_GROUP_SIZE).",
+)
+@with_appcontext
+def export_parquet(output_dir, row_group_size):
+    """
+    Export every user's calorie intakes as a Parquet dataset partitioned by year.
+    """
+    row_group_size = row_group_size or current_app.config["PARQUET_ROW_GROUP_SIZE"]
+
+    counts = write_partitioned_parquet(
+        iter_dataset_intakes(batch_size=row_group_size),
+        output_dir,
+        row_group_size=row_group_size,
+    )
+
+    for year, count in sorted(counts.items()):
+        click.echo(f"year={year}: {count} rows")
+    click.echo(f"Exported {sum(counts.values())} rows to {output_dir}")
+
+
+@click.command("archive-intakes")
+@click.option(
+    "--older-than-months",
+    type=int,
+    default=None,
+    help="Archive closed months older than this (defaults to ARCHIVE_AFTER_MONTHS).",
+)
+@click.option("--batch-size", type=int, default=200, help="Users per transaction.")
+@click.option("--no-vacuum", is_flag=True, help="Skip VACUUM and ANALYZE afterwards.")
+@with_appcontext
+def archive_intakes(older_than_months, batch_size, no_vacuum):
+    """
+    Pack old daily intakes into compact monthly archive rows.
+    """
+    if older_than_months is None:
+        older_than_months = current_app.config["ARCHIVE_AFTER_MONTHS"]
+    if older_than_months < 1:
+        # Reads of recent days, e.g. group summaries, only search the hot
+        # tier, so the previous month must never be archived
+        raise click.BadParameter(
+            f"must be at least 1, got {older_than_months}",
+            param_hint="--older-than-months / ARCHIVE_AFTER_MONTHS",
+        )
+    cutoff = add_months(date.today(), -older_than_months)
+
+    totals = archive_closed_months(cutoff, batch_size=batch_size)
+    click.echo(
+        f"Archived {totals['rows']} rows into {totals['months']} "
+        f"user-months before {cutoff.isoformat()}"
+    )
+
+    if not no_vacuum:
+        compact_database()
+        click.echo("Ran VACUUM and ANALYZE")
+
+
+@click.command("query-stats")
+@click.option(
+    "--sort",
+    type=click.Choice(["total", "max", "count"]),
+    default="total",
+    help="Order statements by total time, max time or call count.",
+)
+@click.option("--limit", type=int, default=20, help="Number of statements to show.")
+@click.option("--plans", is_flag=True, help="Also print each statement's query plan.")
+@click.option("--reset", is_flag=True, help="Clear the statistics after printing them.")
+@with_appcontext
+def query_stats(sort, limit, plans, reset):
+    """
+    Show the per-statement timings gathered by the slow-query log.
+    """
+    order_by = {"total": "total_ms", "max": "max_ms", "count": "count"}[sort]
+    rows = read_query_stats(order_by=order_by, limit=limit)
+    if not rows:
+        click.echo("No query statistics recorded (is SLOW_QUERY_LOG enabled?)")
+
+    for statement, count, total_ms, max_ms, plan in rows:
+        click.echo(
+            f"{count:>8} calls  {total_ms:>10.1f} ms total  "
+            f"{total_ms / count:>8.2f} ms avg  {max_ms:>8.1f} ms max"
+        )
+        click.echo(f"    {statement}")
+        if plans and plan:
+            for step in plan.splitlines():
+                click.echo(f"      {step}")
+
+    if reset:
+        reset_query_stats()
+        click.echo("Query statistics reset")
+
+
+@click.command("seed")
+@click.option("--users", type=int, default=1000, help="Number of users to create.")
+@click.option("--years", type=float, default=3.0, help="Longest history, in years.")
+@click.option("--seed", "random_seed", type=int, default=0, help="Random seed.")
+@click.option(
+    "--history",
+    type=click.Choice(HISTORY_DISTRIBUTIONS),
+    default="uniform",
+    help="How history lengths are spread across users.",
+)
+@click.option("--gap-rate", type=float, default=0.05, help="Chance a day is not logged.")
+@click.option("--calories-mean", type=float, default=2200, help="Mean daily calories.")
+@click.option("--calories-stddev", type=float, default=450, help="Daily calories spread.")
+@click.option("--password", default="password", help="Password for every seeded user.")
+@click.option("--prefix", default="seed", help="Username and email prefix.")
+@click.option("--batch-size", type=int, default=50000, help="Intake rows per transaction.")
+@click.option("--charts", is_flag=True, help="Also generate stored CSV and Parquet files.")
+@click.option("--pdf-users", type=int, default=0, help="Users that also get a PDF chart.")
+@with_appcontext
+def seed(
+    users,
+    years,
+    random_seed,
+    history,
+    gap_rate,
+    calories_mean,
+    calories_stddev,
+    password,
+    prefix,
+    batch_size,
+    charts,
+    pdf_users,
+):
+    """
+    Fill the database with a synthetic, reproducible dataset for scale testing.
+    """
+    started = time.perf_counter()
+    users_done = rows_done = 0
+    for users_done, rows_done in seed_dataset(
+        users,
+        int(years * 365),
+        seed=random_seed,
+        history=history,
+        gap_rate=gap_rate,
+        calories_mean=calories_mean,
+        calories_stddev=calories_stddev,
+        password=password,
+        prefix=prefix,
+        batch_size=batch_size,
+    ):
+        elapsed = time.perf_counter() - started
+        click.echo(
+            f"\r{users_done}/{users} users, {rows_done} intakes "
+            f"({rows_done / elapsed:,.0f} rows/s)",
+            nl=False,
+        )
+    click.echo()
+
+    if charts:
+        user_ids = db.session.execute(
+            db.select(User.id).order_by(User.id.desc()).limit(users)
+        ).scalars().all()[::-1]
+        for done in seed_charts(user_ids, pdf_limit=pdf_users):
+            if done % 100 == 0 or done == len(user_ids):
+                click.echo(f"\r{done}/{len(user_ids)} chart artifacts", nl=False)
+        click.echo()
+
+    click.echo(
+        f"Seeded {users_done} users and {rows_done} intakes "
+        f"in {time.perf_counter() - started:.1f} s"
+    )
+
+
+@click.command("bulk-register")
+@click.argument("users_file", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Users per transaction (defaults to BULK_REGISTER_BATCH_SIZE).",
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=None,
+    help="Password hashing processes (defaults to BULK_HASH_WORKERS).",
+)
+@with_appcontext
+def bulk_register(users_file, batch_size, workers):
+    """
+    Create the users listed in a CSV file with username, email and password columns.
+    """
+    started = time.perf_counter()
+    result = provision_users(
+        list(csv.DictReader(users_file)),
+        batch_size=batch_size or current_app.config["BULK_REGISTER_BATCH_SIZE"],
+        workers=workers or current_app.config["BULK_HASH_WORKERS"],
+    )
+
+    for conflict in result["conflicts"]:
+        # Data rows start on line 2, after the header
+        click.echo(
+            f"line {conflict['index'] + 2}: {conflict['username'] or '-'} / "
+            f"{conflict['email'] or '-'}: {conflict['error']}"
+        )
+    click.echo(
+        f"Created {result['created']} users, {len(result['conflicts'])} conflicts "
+        f"in {time.perf_counter() - started:.1f} s"
+    )
+
+
+def register_commands(app):
+    """
+    Register the application's CLI commands.
+
+    Args:
+        app (Flask): The Flask application instance.
+    """
+    app.cli.add_command(export_parquet)
+    app.cli.add_command(archive_intakes)
+    app.cli.add_command(query_stats)
+    app.cli.add_command(seed)
+    app.cli.add_command(bulk_register)
@@ -2,18 +2,50 @@ import sys
 
 sys.dont_write_bytecode = True
 
-from flask import request, jsonify, make_response, url_for
+from flask import request, jsonify, make_response, url_for, current_app, redirect
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timedelta
-from io import StringIO
+import time
+from io import StringIO, BytesIO
 import pandas as pd
 
 from app.models.calorie_intake import CalorieIntake
+from app.models.calorie_intake_archive import CalorieIntakeArchive
 from app.models.calorie_charts import CalorieChart
+from app.models.change_sequence import ChangeSequence
+from app.models.chart_image import ChartImage
+from app.models.group import Group
+from app.models.group_member import GroupMember
 from app.models.user import User
 from app import db
-from app.utils.charts_utils import generate_calorie_chart_pdf
-from app.utils.jwt_utils import encrypt, decrypt
+from app.utils.charts_utils import (
+    CHART_IMAGE_FORMATS,
+    CHART_IMAGE_SIZES,
+    generate_calorie_chart_pdf,
+    render_calorie_chart_image,
+)
+from app.utils.jwt_utils import admin_required, sign_artifact, verify_artifact
+from app.utils.export_utils import write_parquet
+from app.utils.rate_limit_utils import check_rate_limit, concurrency_slot, rate_limited
+from app.utils.intake_utils import (
+    AGGREGATES,
+    fetch_changed_intakes,
+    fetch_intakes,
+    summarize_ranges,
+    take_archived,
+)
+from app.utils.group_utils import (
+    cache_summary,
+    get_cached_summary,
+    group_generation,
+    invalidate_group,
+    summarize_group,
+)
+from app.utils.compression_utils import (
+    negotiate_encoding,
+    get_cached_compressed,
+    is_compressible,
+)
 from app.main import main_bp
 
 
@@ -35,6 +67,7 @@ def create_intake():
         # If the payload is not a list, assume it's a single entry
         data = [data]
 
+    entries = []
     for entry in data:
         calories = entry.get("calories")
         date_str = entry.get("date")
@@ -44,6 +77,15 @@ def create_intake():
         except ValueError:
             return jsonify({"error": "Invalid date format"}), 400
 
+        entries.append((date, calories))
+
+    # Every record written by this request shares one change sequence number
+    change_seq = ChangeSequence.next_value(CalorieIntake.__tablename__)
+
+    # Days already packed into the archive move back to the hot tier
+    archived = take_archived(user_id, [date for date, _ in entries])
+
+    for date, calories in entries:
         existing_intake = CalorieIntake.query.filter_by(
             user_id=user_id, date=date
         ).first()
@@ -51,9 +93,15 @@ def create_intake():
         if existing_intake:
             # If an intake record for the same date already exists, update the calories
             existing_intake.calories += calories
+            existing_intake.change_seq = change_seq
         else:
             # If no intake record for the same date exists, create a new record
-            intake = CalorieIntake(user_id=user_id, date=date, calories=calories)
+            intake = CalorieIntake(
+                user_id=user_id,
+                date=date,
+                calories=archived.pop(date, 0) + calories,
+                change_seq=change_seq,
+            )
             db.session.add(intake)
 
     db.session.commit()
@@ -70,13 +118,18 @@ def get_intakes():
     Accepts optional query parameters:
         - start_date (str): The start date in the format YYYY-MM-DD.
         - end_date (str): The end date in the format YYYY-MM-DD.
+        - since (int): A watermark from a previous call. When given, only
+          records changed after it are returned, together with a new watermark.
 
     Returns:
         A JSON response with the calorie intake records or an error message.
+        Without ``since`` the response is a list of records and the current
+        watermark is sent in the ``X-Watermark`` header.
     """
     user_id = get_jwt_identity()
     start_date_str = request.args.get("start_date")
     end_date_str = request.args.get("end_date")
+    since_str = request.args.get("since")
 
     try:
         start_date = (
@@ -90,24 +143,135 @@ def get_intakes():
     except ValueError:
         return jsonify({"error": "Invalid date format"}), 400
 
-    query = CalorieIntake.query.filter_by(user_id=user_id)
-    if start_date:
-        query = query.filter(CalorieIntake.date >= start_date)
-    if end_date:
-        query = query.filter(CalorieIntake.date <= end_date)
-
-    query = query.order_by(CalorieIntake.date.desc())
-
+    try:
+        since = int(since_str) if since_str is not None else None
+    except ValueError:
+        return jsonify({"error": "Invalid watermark"}), 400
+
+    if since is not None:
+        # The cost depends on the number of changes rather than the length
+        # of the history
+        changed, watermark = fetch_changed_intakes(user_id, since, start_date, end_date)
+        intakes = [
+            {"date": date.isoformat(), "calories": calories}
+            for date, calories in changed
+        ]
+
+        return jsonify({"intakes": intakes, "watermark": watermark}), 200
+
+    # Read before the rows: a write landing in between is then sent again
+    # on the next sync instead of being skipped by it
+    watermark = current_watermark(user_id)
     intakes = [
-        {"date": intake.date.isoformat(), "calories": intake.calories}
-        for intake in query.all()
+        {"date": date.isoformat(), "calories": calories}
+        for date, calories in fetch_intakes(user_id, start_date, end_date)
     ]
 
-    return jsonify(intakes), 200
+    response = make_response(jsonify(intakes), 200)
+    response.headers["X-Watermark"] = str(watermark)
+    return response
+
+
+def current_watermark(user_id):
+    """
+    Return the highest change sequence number among a user's intake records.
+
+    Archived months keep the highest number of the records packed into
+    them, so archiving never moves the watermark backwards.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        int: The watermark, or 0 when the user has no records.
+    """
+    hot = db.session.execute(
+        db.select(db.func.max(CalorieIntake.change_seq)).filter_by(user_id=user_id)
+    ).scalar()
+    archived = db.session.execute(
+        db.select(db.func.max(CalorieIntakeArchive.change_seq)).filter_by(
+            user_id=user_id
+        )
+    ).scalar()
+    return max(hot or 0, archived or 0)
+
+
+@main_bp.route("/intake/batch", methods=["POST"])
+@jwt_required()
+def get_intake_summaries():
+    """
+    Summarize calorie intake over many named date ranges in one request.
+
+    Expects a JSON payload with the following fields:
+        - ranges (list): Objects with a ``name`` and optional ``start_date``
+          and ``end_date`` (YYYY-MM-DD), and optionally their own ``aggregates``.
+        - aggregates (list): The default aggregates for every range, any of
+          total, average, count, min, max and series. Defaults to total and average.
+
+    All ranges are answered from a single read of the span covering them.
+
+    Returns:
+        A JSON response with the summary of each range keyed by name or an error message.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json()
+
+    ranges = data.get("ranges") if isinstance(data, dict) else None
+    if not isinstance(ranges, list) or not ranges:
+        return jsonify({"error": "Missing required fields"}), 400
+    if len(ranges) > current_app.config["BATCH_MAX_RANGES"]:
+        return jsonify({"error": "Too many ranges"}), 400
+
+    default_aggregates = data.get("aggregates", ["total", "average"])
+
+    parsed = []
+    names = set()
+    for entry in ranges:
+        name = entry.get("name") if isinstance(entry, dict) else None
+        if not name:
+            return jsonify({"error": "Missing required fields"}), 400
+        if not isinstance(name, str):
+            return jsonify({"error": "Range names must be strings"}), 400
+        if name in names:
+            return jsonify({"error": f"Duplicate range name {name}"}), 400
+        names.add(name)
+
+        aggregates = entry.get("aggregates", default_aggregates)
+        if not isinstance(aggregates, list) or any(
+            aggregate not in AGGREGATES for aggregate in aggregates
+        ):
+            return jsonify({"error": "Invalid aggregate"}), 400
+
+        try:
+            start_date = (
+                datetime.strptime(entry["start_date"], "%Y-%m-%d").date()
+                if entry.get("start_date")
+                else None
+            )
+            end_date = (
+                datetime.strptime(entry["end_date"], "%Y-%m-%d").date()
+                if entry.get("end_date")
+                else None
+            )
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid date format"}), 400
+
+        parsed.append((name, start_date, end_date, aggregates))
+
+    # The covering span is open-ended on a side if any range is
+    starts = [start_date for _, start_date, _, _ in parsed]
+    ends = [end_date for _, _, end_date, _ in parsed]
+    span_start = None if None in starts else min(starts)
+    span_end = None if None in ends else max(ends)
+
+    intakes = fetch_intakes(user_id, span_start, span_end, descending=False)
+
+    return jsonify(summarize_ranges(intakes, parsed)), 200
 
 
 @main_bp.route("/chart", methods=["GET"])
 @jwt_required()
+@rate_limited("render")
 def get_calorie_chart():
     """
     Generate and retrieve a PDF report with a calorie intake chart.
@@ -135,16 +299,9 @@ def get_calorie_chart():
     except ValueError:
         return jsonify({"error": "Invalid date format"}), 400
 
-    query = CalorieIntake.query.filter_by(user_id=user_id)
-    if start_date:
-        query = query.filter(CalorieIntake.date >= start_date)
-    if end_date:
-        query = query.filter(CalorieIntake.date <= end_date)
-
-    query = query.order_by(CalorieIntake.date.desc())
     data = [
-        {"Date": intake.date.strftime("%Y-%m-%d"), "Calories": intake.calories}
-        for intake in query.all()
+        {"Date": date.strftime("%Y-%m-%d"), "Calories": calories}
+        for date, calories in fetch_intakes(user_id, start_date, end_date)
     ]
 
     df = pd.DataFrame(data)
@@ -162,8 +319,8 @@ def get_calorie_chart():
     db.session.commit()
 
     # Construct the URL to download the PDF file
-    pdf_url = url_for(
-        "main.download_calorie_pdf", user_id=encrypt(user_id), _external=True
+    pdf_url = artifact_url(
+        "main.download_calorie_pdf", user_id, "pdf", calorie_pdf.pdf_version
     )
 
     # Create JSON response with the URL
@@ -173,31 +330,162 @@ def get_calorie_chart():
 
 @main_bp.route("/download_pdf", methods=["GET"])
 def download_calorie_pdf():
-    # Retrieve the encrypted user_id from the query parameter
-    encrypted_user_id = request.args.get("user_id")
+    return send_artifact("pdf", "application/pdf", "calorie_chart.pdf")
+
+
+@main_bp.route("/chart/image", methods=["GET"])
+@jwt_required()
+def get_calorie_chart_image():
+    """
+    Retrieve the calorie intake chart as a PNG or SVG image.
+
+    Only the plot is rendered, without the PDF report or its data table.
+    Images are cached per user, date range, size and data version, up to
+    CHART_IMAGE_CACHE_PER_USER images per user. A request without the
+    current data version (``v``) is redirected to the versioned URL, whose
+    response never changes and is served with long-lived cache headers.
+    Only image responses count against the "image" rate limit, not
+    redirects or 304s, and renders of uncached images share the global
+    "render" concurrency cap.
+
+    Accepts optional query parameters:
+        - start_date (str): The start date in the format YYYY-MM-DD.
+        - end_date (str): The end date in the format YYYY-MM-DD.
+        - size (str): One of thumbnail, card or full. Defaults to card.
+        - format (str): Either png or svg. Defaults to png.
+        - v (int): The data version, as returned by the redirect.
+
+    Returns:
+        The image, a redirect to the versioned image URL, or an error message.
+    """
+    user_id = get_jwt_identity()
+    start_date_str = request.args.get("start_date")
+    end_date_str = request.args.get("end_date")
+    size = request.args.get("size", "card")
+    image_format = request.args.get("format", "png")
 
-    # Decrypt the encrypted user_id
     try:
-        user_id = decrypt(encrypted_user_id)
-    except Exception as e:
-        return jsonify({"error": "Invalid encrypted user_id"}), 400
+        start_date = (
+            datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            if start_date_str
+            else None
+        )
+        end_date = (
+            datetime.strptime(end_date_str, "%Y-%m-%d").date() if end_date_str else None
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid date format"}), 400
 
-    # Retrieve the PDF content from the database
-    calorie_pdf = CalorieChart.query.filter_by(user_id=user_id).first()
-    if not calorie_pdf:
-        return jsonify({"error": "No PDF data found for the user"}), 404
+    if size not in CHART_IMAGE_SIZES:
+        return jsonify({"error": "Invalid size"}), 400
+    if image_format not in CHART_IMAGE_FORMATS:
+        return jsonify({"error": "Invalid format"}), 400
+
+    data_version = current_watermark(user_id)
+    if request.args.get("v") != str(data_version):
+        response = redirect(
+            url_for(
+                "main.get_calorie_chart_image",
+                start_date=start_date_str,
+                end_date=end_date_str,
+                size=size,
+                format=image_format,
+                v=data_version,
+            )
+        )
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
 
-    pdf_bytes = calorie_pdf.pdf
+    range_key = (
+        f"{start_date.isoformat() if start_date else ''}:"
+        f"{end_date.isoformat() if end_date else ''}"
+    )
+    etag = f"{user_id}-{range_key}-{size}-{data_version}.{image_format}"
+    cache_control = (
+        f"private, max-age={current_app.config['CHART_IMAGE_MAX_AGE']}, immutable"
+    )
 
-    # Send the bytes using send_file
-    response = make_response(pdf_bytes)
-    response.headers["Content-Disposition"] = "attachment; filename=calorie_chart.pdf"
-    response.mimetype = "application/pdf"
-    return response
+    # Revalidation of the current version needs neither the image nor a
+    # token. compress_response appends the encoding to the ETag of
+    # compressed formats, so the tag is matched without that suffix.
+    matched = next(
+        (
+            tag
+            for tag in request.if_none_match.as_set(include_weak=True)
+            if tag == etag or tag.startswith(f"{etag}-")
+        ),
+        None,
+    )
+    if matched:
+        response = make_response("", 304)
+        response.set_etag(matched)
+        response.headers["Cache-Control"] = cache_control
+        if CHART_IMAGE_FORMATS[image_format] in current_app.config["COMPRESS_MIMETYPES"]:
+            response.vary.add("Accept-Encoding")
+        return response
+
+    limited = check_rate_limit("image")
+    if limited:
+        return limited
+
+    chart_image = ChartImage.query.filter_by(
+        user_id=user_id, range_key=range_key, size=size, format=image_format
+    ).first()
+
+    if not chart_image or chart_image.data_version != data_version:
+        data = [
+            {"Date": date.strftime("%Y-%m-%d"), "Calories": calories}
+            for date, calories in fetch_intakes(user_id, start_date, end_date)
+        ]
+        with concurrency_slot("render") as busy:
+            if busy:
+                return busy
+            content = render_calorie_chart_image(
+                pd.DataFrame(data, columns=["Date", "Calories"]), size, image_format
+            )
+
+        # Only the newest version of each image is kept. OR REPLACE swaps
+        # the row atomically, so concurrent first renders of the same image
+        # cannot clash on the unique key, and gives it a fresh ID so IDs
+        # follow render order for the eviction below.
+        db.session.execute(
+            db.insert(ChartImage).prefix_with("OR REPLACE"),
+            {
+                "user_id": user_id,
+                "range_key": range_key,
+                "size": size,
+                "format": image_format,
+                "data_version": data_version,
+                "content": content,
+            },
+        )
+        # Ranges are arbitrary, so only the most recently rendered images
+        # of each user are kept
+        recent = (
+            db.select(ChartImage.id)
+            .filter_by(user_id=user_id)
+            .order_by(ChartImage.id.desc())
+            .limit(current_app.config["CHART_IMAGE_CACHE_PER_USER"])
+        )
+        db.session.execute(
+            db.delete(ChartImage).where(
+                ChartImage.user_id == user_id, ChartImage.id.not_in(recent)
+            )
+        )
+        db.session.commit()
+    else:
+        content = chart_image.content
+
+    response = make_response(content)
+    response.mimetype = CHART_IMAGE_FORMATS[image_format]
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response.make_conditional(request)
 
 
 @main_bp.route("/csv", methods=["GET"])
 @jwt_required()
+@rate_limited("export")
 def get_calorie_csv():
     """
     Generate and retrieve a CSV file with calorie intake data.
@@ -205,13 +493,17 @@ def get_calorie_csv():
     Accepts optional query parameters:
         - start_date (str): The start date in the format YYYY-MM-DD.
         - end_date (str): The end date in the format YYYY-MM-DD.
+        - since (int): A watermark from a previous call. When given, the CSV
+          holds only the records changed after it.
 
     Returns:
-        A JSON response containing the URL to download the CSV file or an error message.
+        A JSON response containing the URL to download the CSV file and the
+        new watermark, or an error message.
     """
     user_id = get_jwt_identity()  # Get user ID from JWT token
     start_date_str = request.args.get("start_date")
     end_date_str = request.args.get("end_date")
+    since_str = request.args.get("since")
 
     try:
         start_date = (
@@ -225,19 +517,23 @@ def get_calorie_csv():
     except ValueError:
         return jsonify({"error": "Invalid date format"}), 400
 
-    query = CalorieIntake.query.filter_by(user_id=user_id)
-    if start_date:
-        query = query.filter(CalorieIntake.date >= start_date)
-    if end_date:
-        query = query.filter(CalorieIntake.date <= end_date)
+    try:
+        since = int(since_str) if since_str is not None else None
+    except ValueError:
+        return jsonify({"error": "Invalid watermark"}), 400
 
-    query = query.order_by(CalorieIntake.date.desc())
+    if since is not None:
+        intakes, watermark = fetch_changed_intakes(user_id, since, start_date, end_date)
+    else:
+        # Read before the rows, as in get_intakes
+        watermark = current_watermark(user_id)
+        intakes = fetch_intakes(user_id, start_date, end_date)
 
     data = [
-        {"Date": intake.date.strftime("%Y-%m-%d"), "Calories": intake.calories}
-        for intake in query.all()
+        {"Date": date.strftime("%Y-%m-%d"), "Calories": calories}
+        for date, calories in intakes
     ]
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(data, columns=["Date", "Calories"])
 
     csv_content = StringIO()
     df.to_csv(csv_content, index=False)
@@ -266,46 +562,428 @@ def get_calorie_csv():
     csv_bytes = calorie_chart.csv
 
     # Construct the URL to download the CSV file
-    csv_url = url_for(
-        "main.download_calorie_csv", user_id=encrypt(user_id), _external=True
+    csv_url = artifact_url(
+        "main.download_calorie_csv", user_id, "csv", calorie_chart.csv_version
     )
 
     # Create JSON response with the URL
-    response_data = {"csv_url": csv_url, "message": "CSV file generated successfully."}
+    response_data = {
+        "csv_url": csv_url,
+        "watermark": watermark,
+        "message": "CSV file generated successfully.",
+    }
 
     return jsonify(response_data), 200
 
 
 @main_bp.route("/download_csv", methods=["GET"])
 def download_calorie_csv():
-    # Retrieve the user_id from the query parameters
-    encrypted_user_id = request.args.get("user_id")
+    return send_artifact("csv", "text/csv", "calorie_data.csv")
+
+
+@main_bp.route("/parquet", methods=["GET"])
+@jwt_required()
+@rate_limited("export")
+def get_calorie_parquet():
+    """
+    Generate and retrieve a Parquet file with calorie intake data.
+
+    The file holds typed ``date`` (date32) and ``calories`` (int32) columns,
+    is zstd-compressed and is written in bounded-memory row groups.
+
+    Accepts optional query parameters:
+        - start_date (str): The start date in the format YYYY-MM-DD.
+        - end_date (str): The end date in the format YYYY-MM-DD.
+
+    Returns:
+        A JSON response containing the URL to download the Parquet file or an error message.
+    """
+    user_id = get_jwt_identity()
+    start_date_str = request.args.get("start_date")
+    end_date_str = request.args.get("end_date")
 
-    # Decrypt the encrypted user_id
     try:
-        user_id = decrypt(encrypted_user_id)
-    except Exception as e:
-        return jsonify({"error": "Invalid encrypted user_id"}), 400
+        start_date = (
+            datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            if start_date_str
+            else None
+        )
+        end_date = (
+            datetime.strptime(end_date_str, "%Y-%m-%d").date() if end_date_str else None
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid date format"}), 400
 
-    # Check if user_id is provided
-    if not user_id:
-        return jsonify({"error": "User ID not provided"}), 400
+    parquet_content = BytesIO()
+    write_parquet(
+        fetch_intakes(user_id, start_date, end_date, descending=False),
+        parquet_content,
+        row_group_size=current_app.config["PARQUET_ROW_GROUP_SIZE"],
+    )
+    parquet_bytes = parquet_content.getvalue()
 
-    # Retrieve the CSV content from the database
+    # Save Parquet content to the database
     calorie_chart = CalorieChart.query.filter_by(user_id=user_id).first()
+    if calorie_chart:
+        # If entry already exists, update the Parquet content
+        calorie_chart.parquet = parquet_bytes
+    else:
+        # Otherwise, create a new entry
+        calorie_chart = CalorieChart(user_id=user_id, parquet=parquet_bytes)
+        db.session.add(calorie_chart)
+    db.session.commit()
+
+    # Construct the URL to download the Parquet file
+    parquet_url = artifact_url(
+        "main.download_calorie_parquet",
+        user_id,
+        "parquet",
+        calorie_chart.parquet_version,
+    )
+
+    # Create JSON response with the URL
+    response_data = {
+        "parquet_url": parquet_url,
+        "message": "Parquet file generated successfully.",
+    }
+
+    return jsonify(response_data), 200
+
+
+@main_bp.route("/download_parquet", methods=["GET"])
+def download_calorie_parquet():
+    return send_artifact(
+        "parquet", "application/vnd.apache.parquet", "calorie_data.parquet"
+    )
+
+
+def artifact_url(endpoint, user_id, kind, version):
+    """
+    Build a signed, expiring download URL for one version of an artifact.
+
+    The expiry is rounded up to a multiple of ARTIFACT_URL_TTL, so repeat
+    requests within the same window get the same URL and can share one
+    cache entry. A URL stays valid for between one and two TTLs.
+
+    Args:
+        endpoint (str): The download endpoint.
+        user_id (int): The ID of the user owning the artifact.
+        kind (str): The artifact type, e.g. "pdf" or "csv".
+        version (str): The artifact's content version.
+
+    Returns:
+        str: The absolute download URL.
+    """
+    ttl = current_app.config["ARTIFACT_URL_TTL"]
+    expires = (int(time.time()) // ttl + 2) * ttl
+    return url_for(
+        endpoint,
+        user_id=user_id,
+        v=version,
+        exp=expires,
+        sig=sign_artifact(user_id, kind, version, expires),
+        _external=True,
+    )
+
+
+def send_artifact(kind, mimetype, filename):
+    """
+    Serve the artifact version named by a signed download URL.
+
+    The signature and expiry are checked without a database lookup, and a
+    conditional request for the same version is answered with 304 before
+    the database is touched. Responses are immutable and can be cached by
+    the client or a reverse proxy until the URL expires.
+
+    Args:
+        kind (str): The artifact type, i.e. the CalorieChart column.
+        mimetype (str): The response mimetype.
+        filename (str): The download file name.
+
+    Returns:
+        The artifact, a 304 response, or an error message.
+    """
+    try:
+        user_id = int(request.args["user_id"])
+        version = request.args["v"]
+        expires = int(request.args["exp"])
+    except (KeyError, ValueError):
+        return jsonify({"error": "Invalid download link"}), 400
+
+    if not verify_artifact(user_id, kind, version, expires, request.args.get("sig")):
+        return jsonify({"error": "Invalid or expired download link"}), 403
+
+    cache_control = f"public, max-age={expires - int(time.time())}, immutable"
+
+    # The ETag is the version, with an encoding suffix for compressed
+    # copies; the tag that matched is echoed back so the cache entry that
+    # revalidated keeps its own validator
+    matched = next(
+        (
+            tag
+            for tag in request.if_none_match.as_set(include_weak=True)
+            if tag.split("-")[0] == version
+        ),
+        None,
+    )
+    if matched:
+        response = make_response("", 304)
+        response.set_etag(matched)
+        response.headers["Cache-Control"] = cache_control
+        if kind in ("pdf", "csv"):
+            response.vary.add("Accept-Encoding")
+        return response
+
+    version_column = getattr(CalorieChart, f"{kind}_version")
+    calorie_chart = CalorieChart.query.filter(
+        CalorieChart.user_id == user_id, version_column == version
+    ).first()
     if not calorie_chart:
-        return jsonify({"error": "No CSV data found for the user"}), 404
+        return jsonify({"error": f"No {kind.upper()} data found for this version"}), 404
 
-    csv_bytes = calorie_chart.csv
+    response = make_response(getattr(calorie_chart, kind))
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    response.mimetype = mimetype
+    response.set_etag(version)
+    response.headers["Cache-Control"] = cache_control
+
+    if kind in ("pdf", "csv"):
+        return send_cached_compressed(response, calorie_chart, kind)
+    return response
 
-    # Send the bytes using send_file
-    response = make_response(csv_bytes)
-    response.headers["Content-Disposition"] = "attachment; filename=calorie_data.csv"
-    response.mimetype = "text/csv"
 
+def send_cached_compressed(response, chart, field):
+    """
+    Swap a chart download's body for its cached compressed copy when possible.
+
+    Args:
+        response (flask.Response): The uncompressed download response.
+        chart (CalorieChart): The chart row holding the artifact.
+        field (str): The artifact column, "pdf" or "csv".
+
+    Returns:
+        flask.Response: The download response.
+    """
+    if not is_compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+    if encoding is None or len(getattr(chart, field)) < current_app.config[
+        "COMPRESS_MIN_SIZE"
+    ]:
+        return response
+
+    response.set_data(get_cached_compressed(chart, field, encoding))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        # The compressed representation is a different entity
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
     return response
 
 
+@main_bp.route("/groups", methods=["POST"])
+@jwt_required()
+def create_group():
+    """
+    Create a group coached by the authenticated user.
+
+    Expects a JSON payload with the following field:
+        - name (str): The name of the group.
+
+    Returns:
+        A JSON response with the new group's ID and name or an error message.
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    name = data.get("name")
+
+    if not name or not isinstance(name, str):
+        return jsonify({"error": "Missing required fields"}), 400
+
+    group = Group(name=name, coach_id=user_id)
+    db.session.add(group)
+    db.session.commit()
+
+    return jsonify({"id": group.id, "name": group.name}), 201
+
+
+@main_bp.route("/groups/<int:group_id>/join", methods=["POST"])
+@jwt_required()
+def join_group(group_id):
+    """
+    Add the authenticated user to a group, sharing their intake summary with its coach.
+
+    Returns:
+        A JSON response with a success message or an error message.
+    """
+    user_id = get_jwt_identity()
+
+    if not db.session.get(Group, group_id):
+        return jsonify({"error": "Group not found"}), 404
+
+    if not GroupMember.query.filter_by(group_id=group_id, user_id=user_id).first():
+        db.session.add(GroupMember(group_id=group_id, user_id=user_id))
+        db.session.commit()
+        invalidate_group(group_id)
+
+    return jsonify({"message": "Joined group"}), 200
+
+
+@main_bp.route("/groups/<int:group_id>/members/me", methods=["DELETE"])
+@main_bp.route("/groups/<int:group_id>/members/<int:member_id>", methods=["DELETE"])
+@jwt_required()
+def remove_group_member(group_id, member_id=None):
+    """
+    Remove a member from a group, ending the sharing of their intake summary.
+
+    Members can leave a group with ``/members/me``; the group's coach can
+    remove any member by user ID.
+
+    Returns:
+        A JSON response with a success message or an error message.
+    """
+    user_id = get_jwt_identity()
+    member_id = user_id if member_id is None else member_id
+
+    group = db.session.get(Group, group_id)
+    if not group:
+        return jsonify({"error": "Group not found"}), 404
+    if member_id != user_id and group.coach_id != user_id:
+        return jsonify({"error": "Only the group's coach can remove other members"}), 403
+
+    membership = GroupMember.query.filter_by(group_id=group_id, user_id=member_id).first()
+    if not membership:
+        return jsonify({"error": "Not a member of this group"}), 404
+
+    db.session.delete(membership)
+    db.session.commit()
+    invalidate_group(group_id)
+
+    return jsonify({"message": "Removed from group"}), 200
+
+
+@main_bp.route("/groups/<int:group_id>/members", methods=["POST"])
+@admin_required
+def add_group_members(group_id):
+    """
+    Add many users to a group at once. Requires the admin API key in the X-Admin-Key header.
+
+    Expects a JSON payload with the following field:
+        - usernames (list): The usernames of the users to add.
+
+    Returns:
+        A JSON response with the number of members added and the usernames
+        that were not found, or an error message.
+    """
+    data = request.get_json(silent=True) or {}
+    usernames = data.get("usernames")
+
+    if (
+        not isinstance(usernames, list)
+        or not usernames
+        or not all(isinstance(username, str) for username in usernames)
+    ):
+        return jsonify({"error": "usernames must be a non-empty list of strings"}), 400
+
+    if not db.session.get(Group, group_id):
+        return jsonify({"error": "Group not found"}), 404
+
+    users = dict(
+        db.session.execute(
+            db.select(User.username, User.id).filter(User.username.in_(usernames))
+        ).all()
+    )
+    existing = set(
+        db.session.execute(
+            db.select(GroupMember.user_id).filter(
+                GroupMember.group_id == group_id,
+                GroupMember.user_id.in_(users.values()),
+            )
+        ).scalars()
+    )
+    new_ids = set(users.values()) - existing
+
+    if new_ids:
+        db.session.execute(
+            db.insert(GroupMember),
+            [{"group_id": group_id, "user_id": user_id} for user_id in sorted(new_ids)],
+        )
+        db.session.commit()
+        invalidate_group(group_id)
+
+    not_found = [username for username in usernames if username not in users]
+    return jsonify({"added": len(new_ids), "not_found": not_found}), 200
+
+
+@main_bp.route("/groups/<int:group_id>/summary", methods=["GET"])
+@jwt_required()
+def get_group_summary(group_id):
+    """
+    Summarize today's calories, the 7-day average and the last log date of a group's members.
+
+    Only the group's coach may read it. Accepts optional query parameters:
+        - page (int): The 1-based page number, defaults to 1.
+        - per_page (int): Members per page, up to GROUP_SUMMARY_MAX_PER_PAGE.
+
+    Pages are cached in the worker for GROUP_SUMMARY_TTL seconds, so a
+    member's latest intake may take that long to appear. Membership
+    changes take effect in every worker at once, as the cache key includes
+    the group's generation from the shared local store.
+
+    Returns:
+        A JSON response with one page of member summaries or an error message.
+    """
+    user_id = get_jwt_identity()
+
+    group = db.session.get(Group, group_id)
+    if not group:
+        return jsonify({"error": "Group not found"}), 404
+    if group.coach_id != user_id:
+        return jsonify({"error": "Only the group's coach can view its summary"}), 403
+
+    try:
+        page = int(request.args.get("page", 1))
+        per_page = int(
+            request.args.get("per_page", current_app.config["GROUP_SUMMARY_PER_PAGE"])
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid page"}), 400
+
+    if page < 1 or not 1 <= per_page <= current_app.config["GROUP_SUMMARY_MAX_PER_PAGE"]:
+        return jsonify({"error": "Invalid page"}), 400
+
+    today = datetime.now().date()
+    # Read before summarizing, so a page computed from data older than a
+    # concurrent membership change is cached under the old generation
+    key = (group_id, group_generation(group_id), today, page, per_page)
+
+    summary = get_cached_summary(key)
+    if summary is None:
+        total = db.session.execute(
+            db.select(db.func.count())
+            .select_from(GroupMember)
+            .filter_by(group_id=group_id)
+        ).scalar()
+        summary = {
+            "group_id": group_id,
+            "date": today.isoformat(),
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "members": summarize_group(group_id, today, page, per_page),
+        }
+        cache_summary(
+            key,
+            summary,
+            current_app.config["GROUP_SUMMARY_TTL"],
+            current_app.config["GROUP_SUMMARY_CACHE_SIZE"],
+        )
+
+    return jsonify(summary), 200
+
+
 @main_bp.route("/profile", methods=["GET"])
 @jwt_required()
 def get_user_profile():
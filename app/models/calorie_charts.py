@@ -2,18 +2,29 @@ import sys
 
 sys.dont_write_bytecode = True
 
+import hashlib
+
 from app import db
+from sqlalchemy import event
 
 
 class CalorieChart(db.Model):
     """
-    Model class representing PDF and CSV calorie charts for a user.
+    Model class representing PDF, CSV and Parquet calorie charts for a user.
 
     Attributes:
         id (int): The unique identifier for the calorie chart.
         user_id (int): The ID of the user associated with the calorie chart.
         pdf (blob): PDF file of the calorie chart.
         csv (blob): CSV file of the calorie chart.
+        pdf_gzip (blob): Cached gzip-compressed copy of the PDF file.
+        pdf_br (blob): Cached brotli-compressed copy of the PDF file.
+        csv_gzip (blob): Cached gzip-compressed copy of the CSV file.
+        csv_br (blob): Cached brotli-compressed copy of the CSV file.
+        parquet (blob): Parquet file of the calorie intake data.
+        pdf_version (str): Content hash naming the current PDF file.
+        csv_version (str): Content hash naming the current CSV file.
+        parquet_version (str): Content hash naming the current Parquet file.
 
     Methods:
         __repr__(): Return a string representation of the CalorieCharts instance.
@@ -25,6 +36,51 @@ class CalorieChart(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     pdf = db.Column(db.BLOB)
     csv = db.Column(db.BLOB)
+    pdf_gzip = db.Column(db.BLOB)
+    pdf_br = db.Column(db.BLOB)
+    csv_gzip = db.Column(db.BLOB)
+    csv_br = db.Column(db.BLOB)
+    parquet = db.Column(db.BLOB)
+    pdf_version = db.Column(db.String(16))
+    csv_version = db.Column(db.String(16))
+    parquet_version = db.Column(db.String(16))
 
     def __repr__(self):
         return f"<CalorieCharts id:{self.id}>"
+
+
+def content_version(content):
+    """
+    Derive the version name of an artifact from its content.
+
+    Args:
+        content (bytes): The artifact content.
+
+    Returns:
+        str: The first 16 hex digits of its SHA-256, or None for no content.
+    """
+    if content is None:
+        return None
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+@event.listens_for(CalorieChart.pdf, "set")
+def _on_pdf_set(target, value, oldvalue, initiator):
+    """Version the new PDF and drop the cached compressed copies."""
+    target.pdf_version = content_version(value)
+    target.pdf_gzip = None
+    target.pdf_br = None
+
+
+@event.listens_for(CalorieChart.csv, "set")
+def _on_csv_set(target, value, oldvalue, initiator):
+    """Version the new CSV and drop the cached compressed copies."""
+    target.csv_version = content_version(value)
+    target.csv_gzip = None
+    target.csv_br = None
+
+
+@event.listens_for(CalorieChart.parquet, "set")
+def _on_parquet_set(target, value, oldvalue, initiator):
+    """Version the new Parquet file."""
+    target.parquet_version = content_version(value)
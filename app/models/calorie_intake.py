@@ -3,7 +3,7 @@ import sys
 sys.dont_write_bytecode = True
 
 from app import db
-from datetime import date
+from datetime import date, datetime
 
 
 class CalorieIntake(db.Model):
@@ -15,17 +15,31 @@ class CalorieIntake(db.Model):
         user_id (int): The ID of the user associated with the calorie intake record.
         date (date): The date of the calorie intake record.
         calories (int): The number of calories consumed on the specified date.
+        updated_at (datetime): When the record was last created or changed (UTC).
+        change_seq (int): The change sequence number of the last write to the record.
 
     Methods:
         __repr__(): Return a string representation of the CalorieIntake instance.
     """
 
     __tablename__ = "calorie_intakes"
+    __table_args__ = (
+        db.Index("ix_calorie_intakes_user_id_date", "user_id", "date"),
+        db.Index("ix_calorie_intakes_user_id_change_seq", "user_id", "change_seq"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     date = db.Column(db.Date, nullable=False, default=date.today)
     calories = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=db.func.current_timestamp(),
+    )
+    change_seq = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     def __repr__(self):
         return f"<CalorieIntake {self.date.isoformat()} - {self.calories} calories>"
@@ -0,0 +1,95 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import calendar
+import struct
+from datetime import date
+
+from app import db
+
+# Marks a day of the month without a logged intake
+MISSING = -(2**31)
+
+
+class CalorieIntakeArchive(db.Model):
+    """
+    Model class representing a closed month of a user's daily calorie intakes.
+
+    Old daily CalorieIntake rows are packed into one row per user and month
+    so the hot table stays small. A given day lives in exactly one tier: it
+    is either a CalorieIntake row or a value in an archive row.
+
+    Attributes:
+        id (int): The unique identifier for the archive record.
+        user_id (int): The ID of the user associated with the archive record.
+        month (date): The first day of the archived month.
+        calories (blob): One little-endian int32 per day of the month, MISSING for days without an intake.
+        last_date (date): The last day of the month with a logged intake.
+        change_seq (int): The highest change sequence number of the packed records.
+
+    Methods:
+        pack(days): Store a mapping of day of month to calories.
+        unpack(): Return the mapping of day of month to calories.
+        __repr__(): Return a string representation of the CalorieIntakeArchive instance.
+    """
+
+    __tablename__ = "calorie_intake_archives"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "month", name="uq_calorie_intake_archives_user_month"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    month = db.Column(db.Date, nullable=False)
+    calories = db.Column(db.BLOB, nullable=False)
+    last_date = db.Column(db.Date, nullable=False)
+    change_seq = db.Column(db.Integer, nullable=False, default=0)
+
+    def pack(self, days):
+        """
+        Store a mapping of day of month to calories.
+
+        Args:
+            days (dict): Calories keyed by day of month (1-based).
+        """
+        length = calendar.monthrange(self.month.year, self.month.month)[1]
+        values = [days.get(day, MISSING) for day in range(1, length + 1)]
+        self.calories = struct.pack(f"<{length}i", *values)
+        self.last_date = self.month.replace(day=max(days))
+
+    def unpack(self):
+        """
+        Return the mapping of day of month to calories.
+
+        Returns:
+            dict: Calories keyed by day of month (1-based).
+        """
+        values = struct.unpack(f"<{len(self.calories) // 4}i", self.calories)
+        return {
+            day: calories
+            for day, calories in enumerate(values, start=1)
+            if calories != MISSING
+        }
+
+    def __repr__(self):
+        return f"<CalorieIntakeArchive {self.user_id}:{self.month.strftime('%Y-%m')}>"
+
+
+def unpack_intakes(month, packed):
+    """
+    Decode a packed month of intakes without loading the archive row as an object.
+
+    Args:
+        month (date): The first day of the archived month.
+        packed (bytes): The packed calories column.
+
+    Returns:
+        list: (date, calories) tuples in date order.
+    """
+    values = struct.unpack(f"<{len(packed) // 4}i", packed)
+    return [
+        (date(month.year, month.month, day), calories)
+        for day, calories in enumerate(values, start=1)
+        if calories != MISSING
+    ]
@@ -0,0 +1,60 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+from app import db
+
+
+class ChangeSequence(db.Model):
+    """
+    Model class representing a named, monotonically increasing change counter.
+
+    Rows that carry a change sequence number take it from here, so a client
+    can use the highest number it has seen as a watermark and ask only for
+    rows changed after it.
+
+    Attributes:
+        name (str): The name of the sequence, usually the table it numbers.
+        value (int): The last value handed out.
+
+    Methods:
+        next_value(name): Allocate the next value of a sequence.
+        __repr__(): Return a string representation of the ChangeSequence instance.
+    """
+
+    __tablename__ = "change_sequences"
+
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def next_value(name):
+        """
+        Allocate the next value of a sequence within the current transaction.
+
+        The UPDATE takes SQLite's write lock, so no other transaction can
+        allocate (or commit) until this one finishes. Values are therefore
+        committed in increasing order and a watermark never skips a row.
+
+        Args:
+            name (str): The name of the sequence.
+
+        Returns:
+            int: The allocated value.
+        """
+        result = db.session.execute(
+            db.update(ChangeSequence)
+            .where(ChangeSequence.name == name)
+            .values(value=ChangeSequence.value + 1)
+        )
+        if result.rowcount == 0:
+            db.session.add(ChangeSequence(name=name, value=1))
+            db.session.flush()
+            return 1
+
+        return db.session.execute(
+            db.select(ChangeSequence.value).where(ChangeSequence.name == name)
+        ).scalar_one()
+
+    def __repr__(self):
+        return f"<ChangeSequence {self.name}:{self.value}>"
@@ -0,0 +1,46 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+from app import db
+
+
+class ChartImage(db.Model):
+    """
+    Model class representing a cached calorie chart image.
+
+    One image is kept per user, date range, size bucket and format. It is
+    only valid for the data version it was rendered from and is replaced
+    when a newer version is rendered. Only the most recently rendered
+    images of each user are kept, so a higher ID means a newer render.
+
+    Attributes:
+        id (int): The unique identifier for the chart image.
+        user_id (int): The ID of the user associated with the chart image.
+        range_key (str): The requested date range as "start:end", either side may be empty.
+        size (str): The size bucket, e.g. "thumbnail".
+        format (str): The image format, "png" or "svg".
+        data_version (int): The user's intake watermark when the image was rendered.
+        content (blob): The image file.
+
+    Methods:
+        __repr__(): Return a string representation of the ChartImage instance.
+    """
+
+    __tablename__ = "calorie_chart_images"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "user_id", "range_key", "size", "format", name="uq_calorie_chart_images_key"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    range_key = db.Column(db.String(32), nullable=False)
+    size = db.Column(db.String(16), nullable=False)
+    format = db.Column(db.String(8), nullable=False)
+    data_version = db.Column(db.Integer, nullable=False)
+    content = db.Column(db.BLOB, nullable=False)
+
+    def __repr__(self):
+        return f"<ChartImage {self.user_id}:{self.range_key}:{self.size}.{self.format}>"
@@ -0,0 +1,30 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+from app import db
+
+
+class Group(db.Model):
+    """
+    Model class representing a coach's group of clients.
+
+    Attributes:
+        id (int): The unique identifier for the group.
+        name (str): The name of the group.
+        coach_id (int): The ID of the user coaching the group.
+        members (GroupMember): The relationship with the GroupMember model.
+
+    Methods:
+        __repr__(): Return a string representation of the Group instance.
+    """
+
+    __tablename__ = "groups"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(120), nullable=False)
+    coach_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    members = db.relationship("GroupMember", backref="group", lazy="dynamic")
+
+    def __repr__(self):
+        return f"<Group {self.name}>"
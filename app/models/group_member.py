@@ -0,0 +1,31 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+from app import db
+
+
+class GroupMember(db.Model):
+    """
+    Model class representing a user's membership of a coach's group.
+
+    Attributes:
+        id (int): The unique identifier for the membership.
+        group_id (int): The ID of the group.
+        user_id (int): The ID of the member.
+
+    Methods:
+        __repr__(): Return a string representation of the GroupMember instance.
+    """
+
+    __tablename__ = "group_members"
+    __table_args__ = (
+        db.UniqueConstraint("group_id", "user_id", name="uq_group_members_group_user"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    group_id = db.Column(db.Integer, db.ForeignKey("groups.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    def __repr__(self):
+        return f"<GroupMember {self.group_id}:{self.user_id}>"
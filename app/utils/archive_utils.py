@@ -0,0 +1,114 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+from itertools import groupby
+
+from app import db
+from app.models.calorie_intake import CalorieIntake
+from app.models.calorie_intake_archive import CalorieIntakeArchive
+
+
+def archive_closed_months(cutoff, batch_size=200):
+    """
+    Pack daily intakes older than ``cutoff`` into monthly archive rows.
+
+    Users are processed in batches of ``batch_size``, one transaction per
+    batch, so memory and lock time stay bounded. A month that was archived
+    before (and has since gained thawed or late days) is merged into its
+    existing archive row.
+
+    Args:
+        cutoff (date): The first day of the oldest month to keep hot.
+        batch_size (int): Users packed per transaction.
+
+    Returns:
+        dict: The number of user-months archived and hot rows removed.
+    """
+    user_ids = db.session.execute(
+        db.select(CalorieIntake.user_id)
+        .filter(CalorieIntake.date < cutoff)
+        .distinct()
+        .order_by(CalorieIntake.user_id)
+    ).scalars().all()
+
+    totals = {"months": 0, "rows": 0}
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start : start + batch_size]
+
+        # DELETE ... RETURNING takes the write lock before reading, so an
+        # intake written concurrently cannot be dropped without being packed
+        rows = db.session.execute(
+            db.delete(CalorieIntake)
+            .where(CalorieIntake.user_id.in_(batch), CalorieIntake.date < cutoff)
+            .returning(
+                CalorieIntake.user_id,
+                CalorieIntake.date,
+                CalorieIntake.calories,
+                CalorieIntake.change_seq,
+            )
+        ).all()
+        rows.sort(key=lambda row: (row.user_id, row.date))
+
+        groups = [
+            (user_id, month, list(group))
+            for (user_id, month), group in groupby(
+                rows, key=lambda row: (row.user_id, row.date.replace(day=1))
+            )
+        ]
+        pack_months(batch, cutoff, groups)
+        db.session.commit()
+
+        totals["months"] += len(groups)
+        totals["rows"] += len(rows)
+
+    return totals
+
+
+def pack_months(user_ids, cutoff, groups):
+    """
+    Merge a batch of users' old hot rows into their monthly archive rows.
+
+    Args:
+        user_ids (list): The IDs of the users in the batch.
+        cutoff (date): The first day of the oldest month to keep hot.
+        groups (list): (user_id, month, rows) tuples of hot rows older than ``cutoff``.
+    """
+    existing = {
+        (archive.user_id, archive.month): archive
+        for archive in CalorieIntakeArchive.query.filter(
+            CalorieIntakeArchive.user_id.in_(user_ids),
+            CalorieIntakeArchive.month < cutoff,
+        )
+    }
+
+    for user_id, month, rows in groups:
+        archive = existing.get((user_id, month))
+        if archive:
+            days = archive.unpack()
+            change_seq = archive.change_seq
+        else:
+            archive = CalorieIntakeArchive(user_id=user_id, month=month)
+            db.session.add(archive)
+            days = {}
+            change_seq = 0
+
+        for row in rows:
+            days[row.date.day] = days.get(row.date.day, 0) + row.calories
+            change_seq = max(change_seq, row.change_seq)
+
+        archive.pack(days)
+        archive.change_seq = change_seq
+
+
+def compact_database():
+    """
+    Reclaim the space freed by archiving and refresh the query planner statistics.
+
+    VACUUM cannot run inside a transaction, so it is issued on an
+    autocommit connection.
+    """
+    db.session.commit()
+    with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("VACUUM")
+        connection.exec_driver_sql("ANALYZE")
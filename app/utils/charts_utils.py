@@ -9,6 +9,7 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 import matplotlib.dates as mdates
+from matplotlib.figure import Figure
 import pandas as pd
 
 
@@ -101,3 +102,66 @@ def generate_calorie_chart_pdf(dataframe):
 
     # Return the PDF content as bytes
     return buffer.read()
+
+
+# Width and height in inches and the DPI of each chart image size bucket
+CHART_IMAGE_SIZES = {
+    "thumbnail": (3.2, 1.8, 100),
+    "card": (6, 3.5, 100),
+    "full": (10, 6, 120),
+}
+
+CHART_IMAGE_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def render_calorie_chart_image(dataframe, size="card", image_format="png"):
+    """
+    Render only the calorie intake line chart as a PNG or SVG image.
+
+    Unlike generate_calorie_chart_pdf this skips reportlab and the data
+    table, and draws on a standalone Figure rather than pyplot's global
+    state, so it is cheap and safe to call from concurrent requests.
+
+    Args:
+        dataframe (pandas.DataFrame): DataFrame containing calorie intake data.
+        size (str): One of the CHART_IMAGE_SIZES buckets.
+        image_format (str): One of the CHART_IMAGE_FORMATS.
+
+    Returns:
+        bytes: The image content as bytes.
+    """
+    width, height, dpi = CHART_IMAGE_SIZES[size]
+    fig = Figure(figsize=(width, height), dpi=dpi)
+    FigureCanvas(fig)
+    ax = fig.add_subplot()
+
+    if dataframe.empty:
+        ax.text(0.5, 0.5, "No data", ha="center", va="center", transform=ax.transAxes)
+        ax.set_xticks([])
+        ax.set_yticks([])
+    else:
+        dataframe = dataframe.sort_values("Date")
+        dates = pd.to_datetime(dataframe["Date"])
+        ax.plot(
+            dates,
+            dataframe["Calories"],
+            color="blue",
+            linewidth=1 if size == "thumbnail" else 1.5,
+        )
+
+        locator = mdates.AutoDateLocator(maxticks=4 if size == "thumbnail" else 8)
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+
+    if size == "thumbnail":
+        ax.tick_params(labelsize=6)
+    else:
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Calories")
+        ax.set_title("Calorie Intake Report")
+
+    fig.tight_layout()
+
+    img_data = io.BytesIO()
+    fig.savefig(img_data, format=image_format, dpi=dpi)
+    return img_data.getvalue()
@@ -0,0 +1,188 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import gzip
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # listed in requirements.txt; without it only gzip is offered
+    brotli = None
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick the content encoding to use for a response.
+
+    Args:
+        accept_encoding (str): The value of the Accept-Encoding request header.
+
+    Returns:
+        str: "br", "gzip" or None when the client accepts neither.
+    """
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+
+    def quality_of(coding):
+        return accepted.get(coding, accepted.get("*", 0.0))
+
+    candidates = ["gzip"]
+    if brotli is not None:
+        # Brotli wins ties since it produces smaller bodies at similar cost
+        candidates.insert(0, "br")
+
+    best = max(candidates, key=quality_of)
+    return best if quality_of(best) > 0 else None
+
+
+def compress(data, encoding):
+    """
+    Compress a complete payload with the configured level for the encoding.
+
+    Args:
+        data (bytes): The payload to compress.
+        encoding (str): Either "br" or "gzip".
+
+    Returns:
+        bytes: The compressed payload.
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=current_app.config["COMPRESS_BROTLI_LEVEL"])
+    return gzip.compress(
+        data, compresslevel=current_app.config["COMPRESS_GZIP_LEVEL"], mtime=0
+    )
+
+
+def compress_stream(chunks, encoding, level):
+    """
+    Compress an iterable of chunks incrementally.
+
+    Args:
+        chunks (iterable): The chunks of the response body.
+        encoding (str): Either "br" or "gzip".
+        level (int): The compression level or brotli quality.
+
+    Yields:
+        bytes: Compressed chunks.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            output = compressor.process(chunk)
+            if output:
+                yield output
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            output = compressor.compress(chunk)
+            if output:
+                yield output
+        yield compressor.flush()
+
+
+def get_cached_compressed(chart, field, encoding):
+    """
+    Return a compressed copy of a stored chart artifact, compressing it once.
+
+    The compressed bytes are saved next to the original on the CalorieChart
+    row and are cleared whenever the original artifact is replaced.
+
+    Args:
+        chart (CalorieChart): The chart row holding the artifact.
+        field (str): The artifact column, "pdf" or "csv".
+        encoding (str): Either "br" or "gzip".
+
+    Returns:
+        bytes: The compressed artifact.
+    """
+    from app import db
+
+    cache_field = f"{field}_{'br' if encoding == 'br' else 'gzip'}"
+    compressed = getattr(chart, cache_field)
+    if compressed is None:
+        compressed = compress(getattr(chart, field), encoding)
+        setattr(chart, cache_field, compressed)
+        db.session.commit()
+    return compressed
+
+
+def is_compressible(response):
+    """
+    Check whether a response is eligible for compression.
+
+    Args:
+        response (flask.Response): The outgoing response.
+
+    Returns:
+        bool: True if the response may be compressed.
+    """
+    return (
+        200 <= response.status_code < 300
+        and response.status_code != 204
+        and request.method != "HEAD"
+        and "Content-Encoding" not in response.headers
+        and response.mimetype in current_app.config["COMPRESS_MIMETYPES"]
+    )
+
+
+def compress_response(response):
+    """
+    Compress an outgoing response according to the client's Accept-Encoding.
+
+    Registered as an after_request hook. Buffered responses below
+    COMPRESS_MIN_SIZE are left alone; streamed responses are compressed
+    chunk by chunk since their size is not known up front.
+
+    Args:
+        response (flask.Response): The outgoing response.
+
+    Returns:
+        flask.Response: The (possibly compressed) response.
+    """
+    if not is_compressible(response):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return response
+
+    if response.is_streamed or response.direct_passthrough:
+        level = current_app.config[
+            "COMPRESS_BROTLI_LEVEL" if encoding == "br" else "COMPRESS_GZIP_LEVEL"
+        ]
+        response.response = compress_stream(response.response, encoding, level)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config["COMPRESS_MIN_SIZE"]:
+            return response
+        response.set_data(compress(data, encoding))
+
+    response.headers["Content-Encoding"] = encoding
+    if response.get_etag()[0]:
+        # The compressed representation is a different entity
+        etag, weak = response.get_etag()
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
@@ -0,0 +1,132 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+INTAKE_SCHEMA = pa.schema([("date", pa.date32()), ("calories", pa.int32())])
+DATASET_SCHEMA = pa.schema(
+    [("user_id", pa.int32()), ("date", pa.date32()), ("calories", pa.int32())]
+)
+
+
+def write_parquet(rows, sink, schema=INTAKE_SCHEMA, row_group_size=65536, compression="zstd"):
+    """
+    Write rows to a Parquet file one row group at a time.
+
+    Only a single row group is held in memory, so arbitrarily long row
+    iterators (e.g. a streamed SQLAlchemy result) can be exported.
+
+    Args:
+        rows (iterable): Tuples whose values follow the order of ``schema``.
+        sink (str or file-like): The destination path or buffer.
+        schema (pyarrow.Schema): The typed column layout of the file.
+        row_group_size (int): The number of rows per row group.
+        compression (str): The Parquet compression codec.
+
+    Returns:
+        int: The number of rows written.
+    """
+    total = 0
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for batch in batched(rows, row_group_size):
+            writer.write_table(to_table(batch, schema), row_group_size=row_group_size)
+            total += len(batch)
+        if total == 0:
+            # Still produce a valid, empty file with the expected schema
+            writer.write_table(schema.empty_table())
+    return total
+
+
+def write_partitioned_parquet(rows, output_dir, row_group_size=65536, compression="zstd"):
+    """
+    Write the whole intake dataset as a Hive-style dataset partitioned by year.
+
+    Rows must arrive ordered by date so that only one partition file is
+    open at a time; each partition is written to ``year=YYYY/part-0.parquet``.
+
+    Args:
+        rows (iterable): ``(user_id, date, calories)`` tuples ordered by date.
+        output_dir (str): The dataset root directory.
+        row_group_size (int): The number of rows per row group.
+        compression (str): The Parquet compression codec.
+
+    Returns:
+        dict: The number of rows written per year.
+    """
+    counts = {}
+    writer = None
+    current_year = None
+    try:
+        for batch in batched(rows, row_group_size):
+            # A batch may straddle a year boundary, so split it by year
+            start = 0
+            while start < len(batch):
+                year = batch[start][1].year
+                end = start
+                while end < len(batch) and batch[end][1].year == year:
+                    end += 1
+
+                if year != current_year:
+                    if writer is not None:
+                        writer.close()
+                    partition_dir = os.path.join(output_dir, f"year={year}")
+                    os.makedirs(partition_dir, exist_ok=True)
+                    writer = pq.ParquetWriter(
+                        os.path.join(partition_dir, "part-0.parquet"),
+                        DATASET_SCHEMA,
+                        compression=compression,
+                    )
+                    current_year = year
+
+                writer.write_table(
+                    to_table(batch[start:end], DATASET_SCHEMA),
+                    row_group_size=row_group_size,
+                )
+                counts[year] = counts.get(year, 0) + end - start
+                start = end
+    finally:
+        if writer is not None:
+            writer.close()
+    return counts
+
+
+def batched(rows, size):
+    """
+    Split an iterable into lists of at most ``size`` items.
+
+    Args:
+        rows (iterable): The items to split.
+        size (int): The maximum batch length.
+
+    Yields:
+        list: The next batch.
+    """
+    batch = []
+    for row in rows:
+        batch.append(tuple(row))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def to_table(batch, schema):
+    """
+    Build a typed Arrow table from a list of row tuples.
+
+    Args:
+        batch (list): Tuples whose values follow the order of ``schema``.
+        schema (pyarrow.Schema): The column layout.
+
+    Returns:
+        pyarrow.Table: The table.
+    """
+    columns = list(zip(*batch))
+    arrays = [
+        pa.array(column, type=field.type) for column, field in zip(columns, schema)
+    ]
+    return pa.Table.from_arrays(arrays, schema=schema)
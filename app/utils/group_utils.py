@@ -0,0 +1,197 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from app import db
+from app.models.calorie_intake import CalorieIntake
+from app.models.calorie_intake_archive import CalorieIntakeArchive
+from app.models.group_member import GroupMember
+from app.models.user import User
+from app.utils.local_store import get_connection, register_schema
+
+register_schema(
+    """
+    CREATE TABLE IF NOT EXISTS group_generations (
+        group_id INTEGER PRIMARY KEY,
+        generation INTEGER NOT NULL
+    );
+    """
+)
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def summarize_group(group_id, today, page, per_page):
+    """
+    Summarize recent calorie intake for one page of a group's members.
+
+    A single grouped query answers the whole page: the page of members is
+    taken from the (group_id, user_id) index and joined to the last seven
+    days of their intakes through the (user_id, date) index, so the cost
+    follows the page size rather than the group size or history length.
+    The seven-day window is always in the hot tier, as ``archive-intakes``
+    refuses to archive the previous month; the last log date falls back to
+    the archive for members who have not logged recently.
+
+    Args:
+        group_id (int): The ID of the group.
+        today (date): The day the summary is for.
+        page (int): The 1-based page number.
+        per_page (int): Members per page.
+
+    Returns:
+        list: Dicts with each member's ``user_id``, ``username``, calories
+        ``today``, ``average_7d`` over the logged days of the last seven
+        days and ``last_log_date``, ordered by user ID.
+    """
+    week_start = today - timedelta(days=6)
+
+    members = (
+        db.select(GroupMember.user_id)
+        .filter_by(group_id=group_id)
+        .order_by(GroupMember.user_id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+        .subquery()
+    )
+
+    # MAX over the (user_id, date) index is a single index lookup
+    latest = db.aliased(CalorieIntake)
+    last_hot = (
+        db.select(db.func.max(latest.date))
+        .filter(latest.user_id == members.c.user_id)
+        .correlate(members)
+        .scalar_subquery()
+    )
+    last_archived = (
+        db.select(db.func.max(CalorieIntakeArchive.last_date))
+        .filter(CalorieIntakeArchive.user_id == members.c.user_id)
+        .correlate(members)
+        .scalar_subquery()
+    )
+    # A thawed old day can leave the hot tier's latest date behind the
+    # archive's, so take the later of the two, whichever exists
+    last_log_date = db.func.max(
+        db.func.coalesce(last_hot, last_archived),
+        db.func.coalesce(last_archived, last_hot),
+        type_=db.Date,
+    )
+
+    rows = db.session.execute(
+        db.select(
+            members.c.user_id,
+            User.username,
+            db.func.sum(
+                db.case((CalorieIntake.date == today, CalorieIntake.calories))
+            ),
+            db.func.sum(CalorieIntake.calories),
+            db.func.count(db.distinct(CalorieIntake.date)),
+            last_log_date,
+        )
+        .join(User, User.id == members.c.user_id)
+        .outerjoin(
+            CalorieIntake,
+            (CalorieIntake.user_id == members.c.user_id)
+            & CalorieIntake.date.between(week_start, today),
+        )
+        .group_by(members.c.user_id, User.username)
+        .order_by(members.c.user_id)
+    )
+
+    return [
+        {
+            "user_id": user_id,
+            "username": username,
+            "today": today_calories or 0,
+            "average_7d": round(week_total / days, 2) if days else None,
+            "last_log_date": last_date.isoformat() if last_date else None,
+        }
+        for user_id, username, today_calories, week_total, days, last_date in rows
+    ]
+
+
+def group_generation(group_id):
+    """
+    Return the current cache generation of a group.
+
+    The generation lives in the local store, so it is shared by every
+    worker on the host. Including it in the cache key makes the summaries
+    cached before the last invalidate_group unreachable in all workers.
+
+    Args:
+        group_id (int): The ID of the group.
+
+    Returns:
+        int: The generation, 0 for a group that was never invalidated.
+    """
+    row = get_connection().execute(
+        "SELECT generation FROM group_generations WHERE group_id = ?", (group_id,)
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def get_cached_summary(key):
+    """
+    Return a cached group summary if it has not expired.
+
+    Args:
+        key (tuple): The cache key, starting with the group ID and generation.
+
+    Returns:
+        dict: The cached summary, or None.
+    """
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        expires, summary = entry
+        if expires <= time.monotonic():
+            del _cache[key]
+            return None
+        return summary
+
+
+def cache_summary(key, summary, ttl, max_entries):
+    """
+    Cache a group summary in this process for ``ttl`` seconds.
+
+    Args:
+        key (tuple): The cache key, starting with the group ID and generation.
+        summary (dict): The summary to cache.
+        ttl (float): Seconds the summary stays valid.
+        max_entries (int): The most summaries kept; the oldest are evicted first.
+    """
+    with _lock:
+        _cache[key] = (time.monotonic() + ttl, summary)
+        _cache.move_to_end(key)
+        while len(_cache) > max_entries:
+            _cache.popitem(last=False)
+
+
+def invalidate_group(group_id):
+    """
+    Drop every cached summary page of a group, e.g. after its membership changes.
+
+    Bumps the group's generation so that every worker stops serving its
+    cached pages, and frees this worker's copies straight away. Call it
+    after the change is committed.
+
+    Args:
+        group_id (int): The ID of the group.
+    """
+    get_connection().execute(
+        """
+        INSERT INTO group_generations (group_id, generation) VALUES (?, 1)
+        ON CONFLICT (group_id) DO UPDATE SET generation = generation + 1
+        """,
+        (group_id,),
+    )
+    with _lock:
+        for key in [key for key in _cache if key[0] == group_id]:
+            del _cache[key]
@@ -0,0 +1,291 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import date
+from itertools import accumulate
+
+from app import db
+from app.models.calorie_intake import CalorieIntake
+from app.models.calorie_intake_archive import CalorieIntakeArchive, unpack_intakes
+
+
+@contextmanager
+def read_snapshot():
+    """
+    Run the enclosed reads against one consistent database snapshot.
+
+    pysqlite only opens a transaction before writes, so consecutive SELECTs
+    otherwise each see whatever was committed at the time. An explicit
+    BEGIN holds one snapshot until the block ends; inside a transaction
+    that is already open, the reads share its snapshot anyway.
+    """
+    connection = db.session.connection()
+    dbapi_connection = connection.connection.driver_connection
+    if dbapi_connection.in_transaction:
+        yield
+        return
+
+    connection.exec_driver_sql("BEGIN")
+    try:
+        yield
+    finally:
+        if dbapi_connection.in_transaction:
+            connection.exec_driver_sql("COMMIT")
+
+
+def fetch_intakes(user_id, start_date=None, end_date=None, descending=True):
+    """
+    Retrieve a user's daily intakes from both the hot and the archived tier.
+
+    Both tiers are read in one snapshot, so an archive pass committing in
+    between cannot return the same days from both.
+
+    Args:
+        user_id (int): The ID of the user.
+        start_date (date): The first date to include, if any.
+        end_date (date): The last date to include, if any.
+        descending (bool): Whether to return the newest intake first.
+
+    Returns:
+        list: (date, calories) tuples ordered by date.
+    """
+    query = db.select(CalorieIntake.date, CalorieIntake.calories).filter_by(
+        user_id=user_id
+    )
+    if start_date:
+        query = query.filter(CalorieIntake.date >= start_date)
+    if end_date:
+        query = query.filter(CalorieIntake.date <= end_date)
+    archive_query = db.select(
+        CalorieIntakeArchive.month, CalorieIntakeArchive.calories
+    ).filter_by(user_id=user_id)
+    if start_date:
+        archive_query = archive_query.filter(
+            CalorieIntakeArchive.month >= start_date.replace(day=1)
+        )
+    if end_date:
+        archive_query = archive_query.filter(CalorieIntakeArchive.month <= end_date)
+    with read_snapshot():
+        intakes = [tuple(row) for row in db.session.execute(query)]
+        archived = db.session.execute(archive_query).all()
+
+    for month, packed in archived:
+        intakes.extend(
+            (day, calories)
+            for day, calories in unpack_intakes(month, packed)
+            if (not start_date or day >= start_date) and (not end_date or day <= end_date)
+        )
+
+    intakes.sort(reverse=descending)
+    return intakes
+
+
+def fetch_changed_intakes(user_id, since, start_date=None, end_date=None):
+    """
+    Retrieve a user's intakes changed after a watermark, from both tiers.
+
+    Hot rows are found through the (user_id, change_seq) index. An archive
+    row keeps the highest change sequence number of the rows packed into
+    it, so a month archived after the client's watermark is sent whole;
+    clients apply intakes by date, so days they already have are harmless.
+    Both tiers are read in one snapshot, as in fetch_intakes.
+
+    Args:
+        user_id (int): The ID of the user.
+        since (int): The watermark from the client's previous sync.
+        start_date (date): The first date to include, if any.
+        end_date (date): The last date to include, if any.
+
+    Returns:
+        tuple: (date, calories) tuples in change order, and the new watermark.
+    """
+    query = db.select(
+        CalorieIntake.change_seq, CalorieIntake.date, CalorieIntake.calories
+    ).filter(CalorieIntake.user_id == user_id, CalorieIntake.change_seq > since)
+    if start_date:
+        query = query.filter(CalorieIntake.date >= start_date)
+    if end_date:
+        query = query.filter(CalorieIntake.date <= end_date)
+    archive_query = db.select(
+        CalorieIntakeArchive.change_seq,
+        CalorieIntakeArchive.month,
+        CalorieIntakeArchive.calories,
+    ).filter(
+        CalorieIntakeArchive.user_id == user_id,
+        CalorieIntakeArchive.change_seq > since,
+    )
+    if start_date:
+        archive_query = archive_query.filter(
+            CalorieIntakeArchive.month >= start_date.replace(day=1)
+        )
+    if end_date:
+        archive_query = archive_query.filter(CalorieIntakeArchive.month <= end_date)
+    with read_snapshot():
+        changed = [tuple(row) for row in db.session.execute(query)]
+        archived = db.session.execute(archive_query).all()
+
+    for change_seq, month, packed in archived:
+        changed.extend(
+            (change_seq, day, calories)
+            for day, calories in unpack_intakes(month, packed)
+            if (not start_date or day >= start_date) and (not end_date or day <= end_date)
+        )
+
+    changed.sort()
+    watermark = changed[-1][0] if changed else since
+    return [(day, calories) for _, day, calories in changed], watermark
+
+
+def iter_dataset_intakes(batch_size=65536):
+    """
+    Stream every user's intakes from both tiers, ordered by month.
+
+    Rows are produced month by month in date order across months, so the
+    output can be partitioned by year. Both tiers are streamed, so memory
+    stays bounded however large the dataset is.
+
+    Args:
+        batch_size (int): Rows fetched per round trip from the hot tier.
+
+    Yields:
+        tuple: (user_id, date, calories) rows.
+    """
+    months = db.session.execute(
+        db.select(CalorieIntakeArchive.month).distinct().order_by(CalorieIntakeArchive.month)
+    ).scalars().all()
+
+    hot_rows = db.session.execute(
+        db.select(CalorieIntake.user_id, CalorieIntake.date, CalorieIntake.calories)
+        .order_by(CalorieIntake.date)
+        .execution_options(yield_per=batch_size)
+    )
+    pending = next(hot_rows, None)
+
+    for month in months:
+        next_month = add_months(month, 1)
+
+        # Hot rows up to the end of this month, including days thawed back
+        # into the hot tier after the month was archived
+        while pending is not None and pending.date < next_month:
+            yield pending
+            pending = next(hot_rows, None)
+
+        for user_id, packed in db.session.execute(
+            db.select(CalorieIntakeArchive.user_id, CalorieIntakeArchive.calories)
+            .filter_by(month=month)
+            .execution_options(yield_per=1000)
+        ):
+            for day, calories in unpack_intakes(month, packed):
+                yield user_id, day, calories
+
+    if pending is not None:
+        yield pending
+        yield from hot_rows
+
+
+def take_archived(user_id, dates):
+    """
+    Remove days from the archived tier so they can be written to the hot tier.
+
+    Used before updating intakes so that every day keeps living in exactly
+    one tier. Only the archive rows of the months touched are loaded.
+
+    Args:
+        user_id (int): The ID of the user.
+        dates (iterable): The dates about to be written.
+
+    Returns:
+        dict: Archived calories keyed by date, for the dates that were archived.
+    """
+    months = {day.replace(day=1) for day in dates}
+    if not months:
+        return {}
+
+    taken = {}
+    archives = CalorieIntakeArchive.query.filter(
+        CalorieIntakeArchive.user_id == user_id,
+        CalorieIntakeArchive.month.in_(months),
+    ).all()
+    for archive in archives:
+        days = archive.unpack()
+        for day in dates:
+            if day.replace(day=1) == archive.month and day.day in days:
+                taken[day] = days.pop(day.day)
+
+        if not days:
+            db.session.delete(archive)
+        else:
+            archive.pack(days)
+    return taken
+
+
+AGGREGATES = ("total", "average", "count", "min", "max", "series")
+
+
+def summarize_ranges(intakes, ranges):
+    """
+    Aggregate one date-ordered list of intakes over many date ranges.
+
+    Each range is answered with two binary searches and a prefix-sum
+    lookup, so many ranges cost little more than one once the covering
+    span has been read.
+
+    Args:
+        intakes (list): (date, calories) tuples in ascending date order.
+        ranges (list): (name, start_date, end_date, aggregates) tuples, where
+            either date may be None for an open end.
+
+    Returns:
+        dict: For each range name, the requested aggregates.
+    """
+    dates = [day for day, _ in intakes]
+    calories = [value for _, value in intakes]
+    prefix = [0, *accumulate(calories)]
+
+    results = {}
+    for name, start_date, end_date, aggregates in ranges:
+        low = bisect_left(dates, start_date) if start_date else 0
+        high = bisect_right(dates, end_date) if end_date else len(dates)
+        count = max(high - low, 0)
+        total = prefix[high] - prefix[low] if count else 0
+
+        summary = {
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+        }
+        for aggregate in aggregates:
+            if aggregate == "total":
+                summary["total"] = total
+            elif aggregate == "average":
+                summary["average"] = round(total / count, 2) if count else None
+            elif aggregate == "count":
+                summary["count"] = count
+            elif aggregate == "min":
+                summary["min"] = min(calories[low:high]) if count else None
+            elif aggregate == "max":
+                summary["max"] = max(calories[low:high]) if count else None
+            elif aggregate == "series":
+                summary["series"] = [
+                    {"date": dates[i].isoformat(), "calories": calories[i]}
+                    for i in range(low, high)
+                ]
+        results[name] = summary
+    return results
+
+
+def add_months(month, count):
+    """
+    Return the first day of the month ``count`` months after ``month``.
+
+    Args:
+        month (date): Any day of the starting month.
+        count (int): The number of months to move, may be negative.
+
+    Returns:
+        date: The first day of the resulting month.
+    """
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
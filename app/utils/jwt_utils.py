@@ -2,13 +2,16 @@ import sys
 
 sys.dont_write_bytecode = True
 
-from flask import jsonify
+from flask import current_app, jsonify, request
 from flask_jwt_extended import create_access_token, get_jwt_identity
 from datetime import timedelta
 from functools import wraps
-from cryptography.fernet import Fernet, InvalidToken
 from dotenv import load_dotenv
+import base64
+import hashlib
+import hmac
 import os
+import time
 
 # Load environment variables from .env file
 load_dotenv()
@@ -52,30 +55,64 @@ def jwt_required(func):
     return wrapper
 
 
-cipher_suite = Fernet('zQnZn0OLUGF7ob5bsw3zcw2mYy3_oqKm5BBb5R3TnNo=')
+def admin_required(func):
+    """
+    Decorator function to restrict routes to callers presenting the admin API key.
+
+    Args:
+        func (callable): The route function to be decorated.
+
+    Returns:
+        callable: The decorated route function.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        admin_key = current_app.config.get("ADMIN_API_KEY")
+        if not admin_key or not hmac.compare_digest(
+            request.headers.get("X-Admin-Key", "").encode(), admin_key.encode()
+        ):
+            return jsonify({"error": "Admin access required"}), 403
+        return func(*args, **kwargs)
+
+    return wrapper
 
 
-def encrypt(user_id):
+def sign_artifact(user_id, kind, version, expires):
     """
-    Encrypt the user ID using Fernet encryption.
+    Sign a download URL for one version of a stored artifact.
 
     Args:
-        user_id (int): The user ID to encrypt.
+        user_id (int): The ID of the user owning the artifact.
+        kind (str): The artifact type, e.g. "pdf" or "csv".
+        version (str): The artifact's content version.
+        expires (int): The Unix time after which the URL stops working.
 
     Returns:
-        str: The encrypted user ID.
+        str: The URL-safe HMAC-SHA256 signature.
     """
-    return cipher_suite.encrypt(str(user_id).encode()).decode()
+    message = f"{kind}:{user_id}:{version}:{expires}".encode()
+    key = current_app.config["ARTIFACT_SIGNING_KEY"].encode()
+    digest = hmac.new(key, message, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
 
 
-def decrypt(encrypted_user_id):
+def verify_artifact(user_id, kind, version, expires, signature):
     """
-    Decrypt the encrypted user ID using Fernet decryption.
+    Check a signed artifact URL without touching the database.
 
     Args:
-        encrypted_user_id (str): The encrypted user ID to decrypt.
+        user_id (int): The ID of the user owning the artifact.
+        kind (str): The artifact type, e.g. "pdf" or "csv".
+        version (str): The artifact's content version.
+        expires (int): The Unix time after which the URL stops working.
+        signature (str): The signature taken from the URL.
 
     Returns:
-        int: The decrypted user ID.
+        bool: True if the signature is valid and has not expired.
     """
-    return int(cipher_suite.decrypt(encrypted_user_id.encode()).decode())
+    if expires <= time.time():
+        return False
+    expected = sign_artifact(user_id, kind, version, expires)
+    # Compared as bytes: compare_digest rejects non-ASCII str arguments
+    return hmac.compare_digest(expected.encode(), (signature or "").encode())
@@ -0,0 +1,73 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from flask import current_app
+
+_schemas = []
+_local = threading.local()
+
+
+def register_schema(script):
+    """
+    Register SQL to run on every new local store connection.
+
+    Scripts must be idempotent (``CREATE TABLE IF NOT EXISTS`` and so on).
+
+    Args:
+        script (str): The SQL script.
+    """
+    _schemas.append(script)
+
+
+def get_connection():
+    """
+    Return this thread's connection to the local store.
+
+    The local store is a small SQLite file (LOCAL_STORE_PATH) next to the
+    application, used for state that every gunicorn worker on the host must
+    share, such as rate limit counters. Connections are opened lazily per
+    process and thread, so workers forked from a preloaded master never
+    share a handle.
+
+    Returns:
+        sqlite3.Connection: An autocommit connection in WAL mode.
+    """
+    path = current_app.config["LOCAL_STORE_PATH"]
+    key = (os.getpid(), path)
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    connection = connections.get(key)
+    if connection is None:
+        connection = sqlite3.connect(path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        for script in _schemas:
+            connection.executescript(script)
+        connections[key] = connection
+    return connection
+
+
+@contextmanager
+def transaction():
+    """
+    Run a block inside an immediate (write-locked) local store transaction.
+
+    Yields:
+        sqlite3.Connection: The connection to use inside the block.
+    """
+    connection = get_connection()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    else:
+        connection.execute("COMMIT")
@@ -0,0 +1,172 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import generate_password_hash
+
+from app import db
+from app.models.user import User
+
+# Stays well below SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 10000
+
+
+def provision_users(entries, batch_size=1000, workers=None):
+    """
+    Create many users at once, reporting the rows that could not be created.
+
+    Rows are validated and de-duplicated within the request, checked against
+    existing usernames and emails with set-based IN queries, hashed in
+    parallel in a process pool and inserted in batched transactions.
+
+    Args:
+        entries (list): Dicts with ``username``, ``email`` and ``password``.
+        batch_size (int): Users inserted per transaction.
+        workers (int): Processes used for password hashing, defaults to the CPU count.
+
+    Returns:
+        dict: The number of users ``created`` and a list of ``conflicts``,
+        each with the row ``index``, ``username``, ``email`` and ``error``.
+    """
+    conflicts = []
+    candidates = []
+    seen_usernames = set()
+    seen_emails = set()
+
+    for index, entry in enumerate(entries):
+        entry = entry if isinstance(entry, dict) else {}
+        username = entry.get("username")
+        email = entry.get("email")
+        password = entry.get("password")
+
+        if not all(
+            value and isinstance(value, str) for value in (username, email, password)
+        ):
+            error = "Missing required fields"
+        elif username in seen_usernames:
+            error = "Duplicate username in request"
+        elif email in seen_emails:
+            error = "Duplicate email in request"
+        else:
+            error = None
+
+        if error:
+            conflicts.append(
+                {"index": index, "username": username, "email": email, "error": error}
+            )
+            continue
+
+        seen_usernames.add(username)
+        seen_emails.add(email)
+        candidates.append((index, username, email, password))
+
+    taken_usernames, taken_emails = find_taken(seen_usernames, seen_emails)
+
+    accepted = []
+    for index, username, email, password in candidates:
+        if username in taken_usernames or email in taken_emails:
+            conflicts.append(
+                {
+                    "index": index,
+                    "username": username,
+                    "email": email,
+                    "error": "Username or email already taken",
+                }
+            )
+        else:
+            accepted.append((index, username, email, password))
+
+    password_hashes = hash_passwords([row[3] for row in accepted], workers=workers)
+
+    created = 0
+    for start in range(0, len(accepted), batch_size):
+        batch = accepted[start : start + batch_size]
+        rows = [
+            {"username": username, "email": email, "password_hash": password_hash}
+            for (_, username, email, _), password_hash in zip(
+                batch, password_hashes[start : start + batch_size]
+            )
+        ]
+        try:
+            db.session.execute(db.insert(User.__table__), rows)
+            db.session.commit()
+            created += len(rows)
+        except IntegrityError:
+            # Someone registered one of these names meanwhile; retry the
+            # batch row by row so only the clashing rows are rejected
+            db.session.rollback()
+            for (index, username, email, _), row in zip(batch, rows):
+                try:
+                    db.session.execute(db.insert(User.__table__), [row])
+                    db.session.commit()
+                    created += 1
+                except IntegrityError:
+                    db.session.rollback()
+                    conflicts.append(
+                        {
+                            "index": index,
+                            "username": username,
+                            "email": email,
+                            "error": "Username or email already taken",
+                        }
+                    )
+
+    conflicts.sort(key=lambda conflict: conflict["index"])
+    return {"created": created, "conflicts": conflicts}
+
+
+def find_taken(usernames, emails):
+    """
+    Look up which of the given usernames and emails already exist.
+
+    Args:
+        usernames (set): Candidate usernames.
+        emails (set): Candidate emails.
+
+    Returns:
+        tuple: The sets of taken usernames and taken emails.
+    """
+    taken_usernames = set()
+    taken_emails = set()
+    usernames = list(usernames)
+    emails = list(emails)
+
+    for start in range(0, max(len(usernames), len(emails)), LOOKUP_CHUNK_SIZE):
+        username_chunk = usernames[start : start + LOOKUP_CHUNK_SIZE]
+        email_chunk = emails[start : start + LOOKUP_CHUNK_SIZE]
+        rows = db.session.execute(
+            db.select(User.username, User.email).filter(
+                User.username.in_(username_chunk) | User.email.in_(email_chunk)
+            )
+        )
+        for username, email in rows:
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+    return taken_usernames, taken_emails
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    Hash passwords in parallel across processes.
+
+    Password hashing is deliberately CPU-bound, so threads would be
+    serialized by the GIL; a process pool uses every core instead.
+
+    Args:
+        passwords (list): Plain-text passwords.
+        workers (int): The number of processes, defaults to the CPU count.
+
+    Returns:
+        list: The password hashes, in the same order.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(passwords))
+    if workers <= 1:
+        return [generate_password_hash(password) for password in passwords]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(executor.map(generate_password_hash, passwords, chunksize=chunksize))
@@ -0,0 +1,202 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import re
+import threading
+import time
+from flask import has_request_context, request
+from sqlalchemy import event
+
+from app.utils.local_store import register_schema, transaction
+
+register_schema(
+    """
+    CREATE TABLE IF NOT EXISTS query_stats (
+        statement TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        total_ms REAL NOT NULL,
+        max_ms REAL NOT NULL,
+        plan TEXT
+    );
+    """
+)
+
+_lock = threading.Lock()
+_stats = {}
+_plans = {}
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:, \?)+")
+
+
+def normalize(statement):
+    """
+    Collapse variable-length placeholder lists so IN queries share one entry.
+
+    Args:
+        statement (str): The SQL statement.
+
+    Returns:
+        str: The normalized statement.
+    """
+    return _PLACEHOLDER_LIST.sub("?, ...", " ".join(statement.split()))
+
+
+def parameter_shape(parameters, executemany):
+    """
+    Describe the bound parameters by type without logging their values.
+
+    Args:
+        parameters: The DBAPI parameters.
+        executemany (bool): Whether the statement ran once per parameter set.
+
+    Returns:
+        str: The shape, e.g. ``(int, date)`` or ``500 x (int, str)``.
+    """
+    if executemany:
+        parameters = list(parameters)
+        first = parameters[0] if parameters else ()
+        return f"{len(parameters)} x {parameter_shape(first, False)}"
+    if isinstance(parameters, dict):
+        values = parameters.values()
+    else:
+        values = parameters or ()
+    return "(" + ", ".join(type(value).__name__ for value in values) + ")"
+
+
+def explain(cursor, statement, parameters, executemany):
+    """
+    Run EXPLAIN QUERY PLAN for a statement on the same DBAPI connection.
+
+    Args:
+        cursor: The DBAPI cursor that executed the statement.
+        statement (str): The SQL statement.
+        parameters: The DBAPI parameters.
+        executemany (bool): Whether the statement ran once per parameter set.
+
+    Returns:
+        str: The query plan, one step per line, or None if it cannot be explained.
+    """
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    if executemany:
+        parameters = next(iter(parameters), ())
+    try:
+        rows = cursor.connection.execute(
+            "EXPLAIN QUERY PLAN " + statement, parameters or ()
+        ).fetchall()
+    except Exception:
+        return None
+    return "\n".join(row[-1] for row in rows)
+
+
+def install_query_log(app, engine):
+    """
+    Record every statement's timing and log the slow ones.
+
+    Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with their
+    parameter shape, the route that issued them and their query plan. The
+    plan is captured once per distinct statement. Per-statement count,
+    total and max time are kept in memory and flushed to the local store
+    when each app context ends, so the ``query-stats`` command can report
+    on all workers.
+
+    Args:
+        app (Flask): The Flask application instance.
+        engine (sqlalchemy.engine.Engine): The engine to instrument.
+    """
+    threshold = app.config["SLOW_QUERY_THRESHOLD_MS"]
+    logger = app.logger
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = (time.perf_counter() - conn.info["query_start_times"].pop()) * 1000
+        key = normalize(statement)
+
+        with _lock:
+            stats = _stats.setdefault(key, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+        if elapsed < threshold:
+            return
+
+        if key not in _plans:
+            _plans[key] = explain(cursor, statement, parameters, executemany)
+
+        route = (
+            f"{request.method} {request.endpoint}" if has_request_context() else "-"
+        )
+        logger.warning(
+            "Slow query (%.1f ms) in %s\n%s\nparameters: %s\nplan:\n%s",
+            elapsed,
+            route,
+            statement,
+            parameter_shape(parameters, executemany),
+            _plans[key] or "-",
+        )
+
+    @app.teardown_appcontext
+    def flush(exception=None):
+        flush_query_stats()
+
+
+def flush_query_stats():
+    """
+    Add the statistics gathered since the last flush to the local store.
+    """
+    with _lock:
+        pending = dict(_stats)
+        _stats.clear()
+    if not pending:
+        return
+
+    with transaction() as connection:
+        connection.executemany(
+            "INSERT INTO query_stats (statement, count, total_ms, max_ms, plan) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (statement) DO UPDATE SET "
+            "count = count + excluded.count, "
+            "total_ms = total_ms + excluded.total_ms, "
+            "max_ms = MAX(max_ms, excluded.max_ms), "
+            "plan = COALESCE(excluded.plan, plan)",
+            [
+                (statement, count, total, maximum, _plans.get(statement))
+                for statement, (count, total, maximum) in pending.items()
+            ],
+        )
+
+
+def read_query_stats(order_by="total_ms", limit=20):
+    """
+    Return the aggregated per-statement statistics from the local store.
+
+    Args:
+        order_by (str): One of "total_ms", "max_ms" or "count".
+        limit (int): The maximum number of statements to return.
+
+    Returns:
+        list: (statement, count, total_ms, max_ms, plan) tuples, highest first.
+    """
+    if order_by not in ("total_ms", "max_ms", "count"):
+        raise ValueError(f"Cannot order by {order_by}")
+    with transaction() as connection:
+        return connection.execute(
+            "SELECT statement, count, total_ms, max_ms, plan FROM query_stats "
+            f"ORDER BY {order_by} DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+
+def reset_query_stats():
+    """
+    Delete the aggregated statistics from the local store.
+    """
+    with transaction() as connection:
+        connection.execute("DELETE FROM query_stats")
@@ -0,0 +1,208 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import math
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, jsonify
+from flask_jwt_extended import get_jwt_identity
+
+from app.utils.local_store import register_schema, transaction
+
+register_schema(
+    """
+    CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+        key TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS concurrency_slots (
+        id INTEGER PRIMARY KEY,
+        endpoint_class TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ix_concurrency_slots_class
+        ON concurrency_slots (endpoint_class, expires_at);
+    """
+)
+
+
+def take_token(key, capacity, period):
+    """
+    Take one token from a token bucket in the local store.
+
+    The bucket holds up to ``capacity`` tokens and refills at
+    ``capacity / period`` tokens per second.
+
+    Args:
+        key (str): The bucket key.
+        capacity (int): The bucket size, i.e. the allowed burst.
+        period (float): Seconds to refill an empty bucket.
+
+    Returns:
+        float: 0 if a token was taken, otherwise the seconds until one is available.
+    """
+    rate = capacity / period
+    now = time.time()
+    with transaction() as connection:
+        row = connection.execute(
+            "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+        ).fetchone()
+        tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0
+        else:
+            retry_after = (1 - tokens) / rate
+
+        connection.execute(
+            "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) "
+            "VALUES (?, ?, ?)",
+            (key, tokens, now),
+        )
+    return retry_after
+
+
+def acquire_slot(endpoint_class, limit, lease):
+    """
+    Try to take one of the global concurrency slots of an endpoint class.
+
+    Slots carry a lease so that a worker killed mid-request cannot leak one.
+
+    Args:
+        endpoint_class (str): The endpoint class.
+        limit (int): The maximum number of concurrent requests.
+        lease (float): Seconds after which an unreleased slot expires.
+
+    Returns:
+        int: The slot ID, or None if all slots are taken.
+    """
+    now = time.time()
+    with transaction() as connection:
+        connection.execute(
+            "DELETE FROM concurrency_slots WHERE endpoint_class = ? AND expires_at < ?",
+            (endpoint_class, now),
+        )
+        (in_use,) = connection.execute(
+            "SELECT COUNT(*) FROM concurrency_slots WHERE endpoint_class = ?",
+            (endpoint_class,),
+        ).fetchone()
+        if in_use >= limit:
+            return None
+        cursor = connection.execute(
+            "INSERT INTO concurrency_slots (endpoint_class, expires_at) VALUES (?, ?)",
+            (endpoint_class, now + lease),
+        )
+        return cursor.lastrowid
+
+
+def release_slot(slot_id):
+    """
+    Release a concurrency slot.
+
+    Args:
+        slot_id (int): The slot ID returned by acquire_slot.
+    """
+    with transaction() as connection:
+        connection.execute("DELETE FROM concurrency_slots WHERE id = ?", (slot_id,))
+
+
+def check_rate_limit(endpoint_class):
+    """
+    Take a token from the current user's bucket for an endpoint class.
+
+    Args:
+        endpoint_class (str): The endpoint class, e.g. "render" or "export".
+
+    Returns:
+        Response: A 429 response if the bucket is empty, otherwise None.
+    """
+    config = current_app.config
+    if not config["RATE_LIMIT_ENABLED"] or endpoint_class not in config["RATE_LIMITS"]:
+        return None
+
+    capacity, period = config["RATE_LIMITS"][endpoint_class]
+    retry_after = take_token(f"{endpoint_class}:{get_jwt_identity()}", capacity, period)
+    if not retry_after:
+        return None
+
+    response = jsonify({"error": "Rate limit exceeded"})
+    response.status_code = 429
+    response.headers["Retry-After"] = str(math.ceil(retry_after))
+    return response
+
+
+@contextmanager
+def concurrency_slot(endpoint_class):
+    """
+    Hold one of the global concurrency slots of an endpoint class.
+
+    Waits up to CONCURRENCY_WAIT seconds for a free slot. Classes without an
+    entry in CONCURRENCY_LIMITS are always admitted.
+
+    Args:
+        endpoint_class (str): The endpoint class, e.g. "render".
+
+    Yields:
+        Response: A 503 response if no slot became free, otherwise None.
+    """
+    config = current_app.config
+    limit = config["CONCURRENCY_LIMITS"].get(endpoint_class)
+    if not config["RATE_LIMIT_ENABLED"] or limit is None:
+        yield None
+        return
+
+    deadline = time.monotonic() + config["CONCURRENCY_WAIT"]
+    slot_id = acquire_slot(endpoint_class, limit, config["CONCURRENCY_LEASE"])
+    while slot_id is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+        slot_id = acquire_slot(endpoint_class, limit, config["CONCURRENCY_LEASE"])
+
+    if slot_id is None:
+        response = jsonify({"error": "Server busy, try again later"})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(config["CONCURRENCY_RETRY_AFTER"])
+        yield response
+        return
+
+    try:
+        yield None
+    finally:
+        release_slot(slot_id)
+
+
+def rate_limited(endpoint_class):
+    """
+    Decorator applying per-user rate limits and admission control to a route.
+
+    Each user gets a token bucket per endpoint class, sized by RATE_LIMITS.
+    Classes listed in CONCURRENCY_LIMITS are also capped globally across all
+    workers; a request waits up to CONCURRENCY_WAIT seconds for a free slot
+    and is then shed with 503 instead of queuing. Must be applied below
+    ``jwt_required`` so the user's identity is available.
+
+    Args:
+        endpoint_class (str): The endpoint class, e.g. "render" or "export".
+
+    Returns:
+        callable: The decorator.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            limited = check_rate_limit(endpoint_class)
+            if limited:
+                return limited
+
+            with concurrency_slot(endpoint_class) as busy:
+                if busy:
+                    return busy
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,205 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import csv
+from itertools import repeat
+from datetime import date, datetime, timedelta
+from io import BytesIO, StringIO
+import numpy as np
+import pandas as pd
+from werkzeug.security import generate_password_hash
+
+from app import db
+from app.models.calorie_charts import CalorieChart
+from app.models.calorie_intake import CalorieIntake
+from app.models.change_sequence import ChangeSequence
+from app.models.user import User
+from app.utils.charts_utils import generate_calorie_chart_pdf
+from app.utils.export_utils import write_parquet
+
+HISTORY_DISTRIBUTIONS = ("full", "uniform", "exponential")
+
+
+def seed_dataset(
+    users,
+    days,
+    seed=0,
+    history="uniform",
+    gap_rate=0.05,
+    calories_mean=2200,
+    calories_stddev=450,
+    password="password",
+    prefix="seed",
+    batch_size=50000,
+    end_date=None,
+):
+    """
+    Bulk-insert a synthetic, reproducible population of users and intakes.
+
+    Every user shares one precomputed password hash, and rows go in through
+    Core ``executemany`` inserts in batches, one transaction per batch. The
+    same arguments always produce the same dataset.
+
+    Args:
+        users (int): The number of users to create.
+        days (int): The longest history, in days, ending at ``end_date``.
+        seed (int): The random seed.
+        history (str): How history lengths are spread: "full" (everyone has
+            ``days``), "uniform" or "exponential" (many short, few long).
+        gap_rate (float): The probability that a user skips logging a day.
+        calories_mean (float): The mean daily calories.
+        calories_stddev (float): The standard deviation of daily calories.
+        password (str): The password given to every seeded user.
+        prefix (str): The username and email prefix of seeded users.
+        batch_size (int): Intake rows per insert batch.
+        end_date (date): The last day of history, defaults to today.
+
+    Yields:
+        tuple: (users inserted, intake rows inserted) after each batch.
+    """
+    if history not in HISTORY_DISTRIBUTIONS:
+        raise ValueError(f"Unknown history distribution {history}")
+
+    rng = np.random.default_rng(seed)
+    end_date = end_date or date.today()
+
+    # Values are bound pre-formatted, in SQLite's storage format for the
+    # Date and DateTime columns, to skip per-row type processing
+    all_dates = np.array(
+        [
+            (end_date - timedelta(days=offset)).isoformat()
+            for offset in range(days - 1, -1, -1)
+        ],
+        dtype=object,
+    )
+    password_hash = generate_password_hash(password)
+
+    # Seeding is repeatable, so trade crash safety for insert speed
+    db.session.connection().exec_driver_sql("PRAGMA synchronous=OFF")
+
+    change_seq = ChangeSequence.next_value(CalorieIntake.__tablename__)
+    updated_at = datetime.utcnow().isoformat(" ")
+    first_id = (db.session.execute(db.select(db.func.max(User.id))).scalar() or 0) + 1
+
+    user_rows = []
+    intake_rows = []
+    users_done = 0
+    rows_done = 0
+    for user_id in range(first_id, first_id + users):
+        user_rows.append(
+            {
+                "id": user_id,
+                "username": f"{prefix}{user_id}",
+                "email": f"{prefix}{user_id}@example.com",
+                "password_hash": password_hash,
+            }
+        )
+
+        if history == "full":
+            length = days
+        elif history == "uniform":
+            length = int(rng.integers(1, days + 1))
+        else:
+            length = min(days, 1 + int(rng.exponential(days / 4)))
+
+        logged = rng.random(length) >= gap_rate
+        calories = np.clip(rng.normal(calories_mean, calories_stddev, length), 0, None)
+        intake_rows.extend(
+            zip(
+                repeat(user_id),
+                all_dates[days - length :][logged].tolist(),
+                calories[logged].astype(np.int64).tolist(),
+                repeat(updated_at),
+                repeat(change_seq),
+            )
+        )
+
+        if len(intake_rows) >= batch_size:
+            flush_seed_batch(user_rows, intake_rows)
+            users_done += len(user_rows)
+            rows_done += len(intake_rows)
+            user_rows, intake_rows = [], []
+            yield users_done, rows_done
+
+    if user_rows:
+        flush_seed_batch(user_rows, intake_rows)
+        users_done += len(user_rows)
+        rows_done += len(intake_rows)
+        yield users_done, rows_done
+
+
+def flush_seed_batch(user_rows, intake_rows):
+    """
+    Insert one batch of seeded users and intakes in a single transaction.
+
+    Args:
+        user_rows (list): Parameter dicts for the users table.
+        intake_rows (list): (user_id, date, calories, updated_at, change_seq)
+            tuples for the calorie_intakes table, already in storage format.
+    """
+    db.session.execute(db.insert(User.__table__), user_rows)
+    if intake_rows:
+        db.session.connection().exec_driver_sql(
+            "INSERT INTO calorie_intakes (user_id, date, calories, updated_at, change_seq) "
+            "VALUES (?, ?, ?, ?, ?)",
+            intake_rows,
+        )
+    db.session.commit()
+
+
+def seed_charts(user_ids, pdf_limit=0):
+    """
+    Generate stored chart artifacts for seeded users.
+
+    CSV and Parquet files are built for every user; PDFs, which are far
+    more expensive to render, only for the first ``pdf_limit`` users.
+
+    Args:
+        user_ids (list): The IDs of the users to generate artifacts for.
+        pdf_limit (int): The number of users that also get a PDF.
+
+    Yields:
+        int: The number of users processed so far, after each user.
+    """
+    for index, user_id in enumerate(user_ids):
+        intakes = db.session.execute(
+            db.select(CalorieIntake.date, CalorieIntake.calories)
+            .filter_by(user_id=user_id)
+            .order_by(CalorieIntake.date.desc())
+        ).all()
+
+        # Same layout as DataFrame.to_csv in get_calorie_csv
+        csv_content = StringIO()
+        writer = csv.writer(csv_content, lineterminator="\n")
+        writer.writerow(["Date", "Calories"])
+        writer.writerows(
+            (day.strftime("%Y-%m-%d"), calories) for day, calories in intakes
+        )
+
+        parquet_content = BytesIO()
+        write_parquet(reversed(intakes), parquet_content)
+
+        pdf = None
+        if index < pdf_limit and intakes:
+            pdf = generate_calorie_chart_pdf(
+                pd.DataFrame(
+                    [
+                        {"Date": day.strftime("%Y-%m-%d"), "Calories": calories}
+                        for day, calories in intakes
+                    ]
+                )
+            )
+
+        db.session.add(
+            CalorieChart(
+                user_id=user_id,
+                csv=csv_content.getvalue().encode("utf-8"),
+                parquet=parquet_content.getvalue(),
+                pdf=pdf,
+            )
+        )
+        if index % 1000 == 999:
+            db.session.commit()
+        yield index + 1
+    db.session.commit()
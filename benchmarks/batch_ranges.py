@@ -0,0 +1,112 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from app import create_app, db
+from app.models.calorie_intake import CalorieIntake
+from config import Config
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "batch.db")
+    JWT_SECRET_KEY = Config.JWT_SECRET_KEY or "benchmark-secret"
+
+
+def dashboard_ranges(today):
+    """
+    Return the date ranges a dashboard opens with.
+
+    Args:
+        today (date): The current day.
+
+    Returns:
+        list: (name, start_date, end_date) tuples.
+    """
+    return [
+        ("today", today, today),
+        ("week", today - timedelta(days=today.weekday()), today),
+        ("month", today.replace(day=1), today),
+        ("year_to_date", today.replace(month=1, day=1), today),
+        (
+            "last_year",
+            date(today.year - 1, 1, 1),
+            date(today.year - 1, 12, 31),
+        ),
+    ]
+
+
+def main(iterations=200):
+    app = create_app(BenchmarkConfig)
+    client = app.test_client()
+    today = date.today()
+
+    with app.app_context():
+        db.create_all()
+
+    client.post(
+        "/auth/register",
+        json={"username": "bench", "email": "bench@example.com", "password": "bench"},
+    )
+    token = client.post(
+        "/auth/login", json={"username_or_email": "bench", "password": "bench"}
+    ).get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    rng = random.Random(42)
+    with app.app_context():
+        db.session.execute(
+            db.insert(CalorieIntake),
+            [
+                {
+                    "user_id": 1,
+                    "date": today - timedelta(days=day),
+                    "calories": int(rng.gauss(2200, 400)),
+                }
+                for day in range(3 * 365)
+            ],
+        )
+        db.session.commit()
+
+    ranges = dashboard_ranges(today)
+
+    def fan_out():
+        totals = {}
+        for name, start_date, end_date in ranges:
+            intakes = client.get(
+                f"/user/intake?start_date={start_date}&end_date={end_date}",
+                headers=headers,
+            ).get_json()
+            total = sum(intake["calories"] for intake in intakes)
+            totals[name] = (total, total / len(intakes) if intakes else None)
+        return totals
+
+    payload = {
+        "ranges": [
+            {"name": name, "start_date": str(start_date), "end_date": str(end_date)}
+            for name, start_date, end_date in ranges
+        ]
+    }
+
+    def batch():
+        return client.post("/user/intake/batch", json=payload, headers=headers).get_json()
+
+    for label, func in (("fan-out (5 GETs)", fan_out), ("batch (1 POST)", batch)):
+        func()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = (time.perf_counter() - started) * 1000 / iterations
+        print(f"{label:<20}{elapsed:>8.2f} ms per dashboard")
+
+
+if __name__ == "__main__":
+    main()
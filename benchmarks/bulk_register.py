@@ -0,0 +1,86 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import time
+
+from app import create_app, db
+from app.utils.provisioning_utils import provision_users
+from config import Config
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bulk.db")
+    JWT_SECRET_KEY = Config.JWT_SECRET_KEY or "benchmark-secret"
+    ADMIN_API_KEY = "benchmark-admin"
+
+
+def make_users(prefix, count):
+    """
+    Return registration payloads for distinct users.
+
+    Args:
+        prefix (str): The username and email prefix.
+        count (int): The number of users.
+
+    Returns:
+        list: Dicts with username, email and password.
+    """
+    return [
+        {
+            "username": f"{prefix}{index}",
+            "email": f"{prefix}{index}@example.com",
+            "password": f"password-{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def main(count=200):
+    app = create_app(BenchmarkConfig)
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+
+    started = time.perf_counter()
+    for user in make_users("serial", count):
+        client.post("/auth/register", json=user)
+    serial = time.perf_counter() - started
+
+    # The endpoint is capped, so large imports are sent in chunks
+    max_users = app.config["BULK_REGISTER_MAX_USERS"]
+    users = make_users("bulk", count)
+    started = time.perf_counter()
+    for start in range(0, count, max_users):
+        response = client.post(
+            "/auth/register/bulk",
+            json={"users": users[start : start + max_users]},
+            headers={"X-Admin-Key": BenchmarkConfig.ADMIN_API_KEY},
+        )
+        assert not response.get_json()["conflicts"]
+    bulk = time.perf_counter() - started
+
+    # What the bulk-register command does, with a process pool
+    with app.app_context():
+        started = time.perf_counter()
+        result = provision_users(make_users("cli", count))
+        cli = time.perf_counter() - started
+    assert result["created"] == count
+
+    print(f"{os.cpu_count()} CPUs, {count} users")
+    for label, elapsed in (
+        ("serial /auth/register", serial),
+        (f"bulk ({max_users} per request)", bulk),
+        ("bulk-register command", cli),
+    ):
+        print(f"{label:<24}{elapsed:>8.2f} s{count / elapsed:>10.1f} users/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,105 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gzip
+import json
+import random
+import time
+from datetime import date, timedelta
+from io import StringIO
+import pandas as pd
+
+from app.utils.charts_utils import generate_calorie_chart_pdf
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def build_payloads(days=3 * 365, seed=42):
+    """
+    Build JSON, CSV and PDF payloads shaped like the API's real responses.
+
+    Args:
+        days (int): The length of the synthetic intake history.
+        seed (int): The random seed.
+
+    Returns:
+        dict: A mapping of payload name to bytes.
+    """
+    rng = random.Random(seed)
+    start = date(2021, 1, 1)
+    rows = [
+        {
+            "Date": (start + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "Calories": int(rng.gauss(2200, 400)),
+        }
+        for i in range(days)
+    ]
+    df = pd.DataFrame(rows)
+
+    csv_content = StringIO()
+    df.to_csv(csv_content, index=False)
+
+    intakes = [{"date": row["Date"], "calories": row["Calories"]} for row in rows]
+
+    return {
+        "json": json.dumps(intakes).encode("utf-8"),
+        "csv": csv_content.getvalue().encode("utf-8"),
+        "pdf": generate_calorie_chart_pdf(df),
+    }
+
+
+def measure(func, data, repeat=5):
+    """
+    Time a compression function.
+
+    Args:
+        func (callable): The compression function.
+        data (bytes): The payload.
+        repeat (int): How many runs to take the best of.
+
+    Returns:
+        tuple: The compressed size and the best time in milliseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = func(data)
+        best = min(best, time.perf_counter() - started)
+    return len(output), best * 1000
+
+
+def main():
+    payloads = build_payloads()
+
+    codecs = [
+        (f"gzip-{level}", lambda data, level=level: gzip.compress(data, level, mtime=0))
+        for level in (1, 6, 9)
+    ]
+    if brotli is not None:
+        codecs += [
+            (f"br-{quality}", lambda data, quality=quality: brotli.compress(data, quality=quality))
+            for quality in (1, 5, 9, 11)
+        ]
+
+    print(f"{'payload':<8}{'codec':<10}{'bytes':>10}{'ratio':>8}{'ms':>10}{'MB/s':>10}")
+    for name, data in payloads.items():
+        print(f"{name:<8}{'identity':<10}{len(data):>10}{1.0:>8.2f}{0.0:>10.2f}{'-':>10}")
+        for codec, func in codecs:
+            size, ms = measure(func, data)
+            throughput = len(data) / 1e6 / (ms / 1000) if ms else float("inf")
+            print(
+                f"{name:<8}{codec:<10}{size:>10}{len(data) / size:>8.2f}"
+                f"{ms:>10.2f}{throughput:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
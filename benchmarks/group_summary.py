@@ -0,0 +1,100 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+import time
+from datetime import date
+
+from app import create_app, db
+from app.models.group import Group
+from app.models.group_member import GroupMember
+from app.utils.group_utils import summarize_group
+from app.utils.seed_utils import seed_dataset
+from config import Config
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "groups.db")
+    JWT_SECRET_KEY = Config.JWT_SECRET_KEY or "benchmark-secret"
+    GROUP_SUMMARY_TTL = 0
+
+
+def main(users=5000, iterations=20, per_page=50):
+    app = create_app(BenchmarkConfig)
+    client = app.test_client()
+    today = date.today()
+
+    with app.app_context():
+        db.create_all()
+
+    client.post(
+        "/auth/register",
+        json={"username": "coach", "email": "coach@example.com", "password": "coach"},
+    )
+    token = client.post(
+        "/auth/login", json={"username_or_email": "coach", "password": "coach"}
+    ).get_json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with app.app_context():
+        for _ in seed_dataset(users, 365, seed=42, history="full", end_date=today):
+            pass
+
+        # Groups of growing size, all drawn from the same seeded population
+        group_ids = {}
+        for size in (50, 200, 1000, users):
+            group = Group(name=f"size {size}", coach_id=1)
+            db.session.add(group)
+            db.session.flush()
+            db.session.execute(
+                db.insert(GroupMember),
+                [
+                    {"group_id": group.id, "user_id": user_id}
+                    for user_id in range(2, size + 2)
+                ],
+            )
+            group_ids[size] = group.id
+        db.session.commit()
+
+        # One-user-at-a-time baseline: what 50 GET /user/intake calls cost
+        started = time.perf_counter()
+        for user_id in range(2, per_page + 2):
+            db.session.execute(
+                db.text(
+                    "SELECT date, calories FROM calorie_intakes "
+                    "WHERE user_id = :user_id ORDER BY date DESC"
+                ),
+                {"user_id": user_id},
+            ).all()
+        print(f"{per_page} per-user reads (DB only){(time.perf_counter() - started) * 1000:>8.2f} ms")
+
+        for size, group_id in group_ids.items():
+            summarize_group(group_id, today, 1, per_page)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                summarize_group(group_id, today, 1, per_page)
+            elapsed = (time.perf_counter() - started) * 1000 / iterations
+            print(f"group of {size:>5}, first page  {elapsed:>8.2f} ms")
+
+        last_page = users // per_page
+        started = time.perf_counter()
+        for _ in range(iterations):
+            summarize_group(group_ids[users], today, last_page, per_page)
+        elapsed = (time.perf_counter() - started) * 1000 / iterations
+        print(f"group of {users:>5}, last page   {elapsed:>8.2f} ms")
+
+    group_id = group_ids[users]
+    started = time.perf_counter()
+    for _ in range(iterations):
+        client.get(f"/user/groups/{group_id}/summary?per_page={per_page}", headers=headers)
+    elapsed = (time.perf_counter() - started) * 1000 / iterations
+    print(f"GET summary (uncached)         {elapsed:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
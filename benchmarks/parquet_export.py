@@ -0,0 +1,94 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import time
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+import pandas as pd
+import pyarrow.parquet as pq
+
+from app.utils.export_utils import DATASET_SCHEMA, write_parquet
+
+
+def build_rows(users=1000, days=3 * 365, seed=42):
+    """
+    Build a synthetic ``(user_id, date, calories)`` intake history.
+
+    Args:
+        users (int): The number of users.
+        days (int): The number of days of history per user.
+        seed (int): The random seed.
+
+    Returns:
+        list: The intake rows ordered by date.
+    """
+    rng = random.Random(seed)
+    start = date(2021, 1, 1)
+    return [
+        (user_id, start + timedelta(days=day), int(rng.gauss(2200, 400)))
+        for day in range(days)
+        for user_id in range(1, users + 1)
+    ]
+
+
+def timed(func):
+    """
+    Run a function once and time it.
+
+    Args:
+        func (callable): The function to run.
+
+    Returns:
+        tuple: The function's result and the elapsed time in seconds.
+    """
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main():
+    rows = build_rows()
+    print(f"{len(rows)} rows")
+
+    def write_csv():
+        df = pd.DataFrame(
+            [
+                {"User": user_id, "Date": day.strftime("%Y-%m-%d"), "Calories": calories}
+                for user_id, day, calories in rows
+            ]
+        )
+        csv_content = StringIO()
+        df.to_csv(csv_content, index=False)
+        return csv_content.getvalue().encode("utf-8")
+
+    def write_pq():
+        buffer = BytesIO()
+        write_parquet(rows, buffer, schema=DATASET_SCHEMA)
+        return buffer.getvalue()
+
+    csv_bytes, csv_write = timed(write_csv)
+    parquet_bytes, parquet_write = timed(write_pq)
+
+    _, csv_read = timed(lambda: pd.read_csv(BytesIO(csv_bytes), parse_dates=["Date"]))
+    _, parquet_read = timed(lambda: pq.read_table(BytesIO(parquet_bytes)).to_pandas())
+    _, parquet_column = timed(
+        lambda: pq.read_table(BytesIO(parquet_bytes), columns=["calories"])
+    )
+
+    print(f"{'format':<22}{'bytes':>14}{'write s':>10}{'read s':>10}")
+    print(f"{'csv':<22}{len(csv_bytes):>14}{csv_write:>10.3f}{csv_read:>10.3f}")
+    print(
+        f"{'parquet (zstd)':<22}{len(parquet_bytes):>14}"
+        f"{parquet_write:>10.3f}{parquet_read:>10.3f}"
+    )
+    print(f"{'parquet, one column':<22}{'':>14}{'':>10}{parquet_column:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from app import create_app, db
+from app.models.calorie_intake import CalorieIntake
+from app.models.user import User
+from app.utils.archive_utils import archive_closed_months, compact_database
+from app.utils.intake_utils import add_months, fetch_intakes
+from config import Config
+
+USERS = 2000
+DAYS = 3 * 365
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "tiering.db")
+
+
+def seed(today):
+    """
+    Insert USERS users with DAYS days of history ending today.
+
+    Args:
+        today (date): The last day of history.
+    """
+    rng = random.Random(42)
+    db.session.execute(
+        db.insert(User),
+        [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x"}
+            for i in range(1, USERS + 1)
+        ],
+    )
+    start = today - timedelta(days=DAYS - 1)
+    for user_id in range(1, USERS + 1):
+        db.session.execute(
+            db.insert(CalorieIntake),
+            [
+                {
+                    "user_id": user_id,
+                    "date": start + timedelta(days=day),
+                    "calories": int(rng.gauss(2200, 400)),
+                    "change_seq": 1,
+                }
+                for day in range(DAYS)
+            ],
+        )
+    db.session.commit()
+    compact_database()
+
+
+def measure(today, samples=300):
+    """
+    Time range queries for random users through the tier-merging reader.
+
+    Args:
+        today (date): The last day of history.
+        samples (int): The number of users to query per scenario.
+
+    Returns:
+        dict: Mean milliseconds per query, keyed by scenario.
+    """
+    rng = random.Random(7)
+    scenarios = {
+        "last 30 days": (today - timedelta(days=29), today),
+        "year to date": (today.replace(month=1, day=1), today),
+        "full history": (None, None),
+    }
+    results = {}
+    for name, (start_date, end_date) in scenarios.items():
+        users = [rng.randint(1, USERS) for _ in range(samples)]
+        started = time.perf_counter()
+        for user_id in users:
+            fetch_intakes(user_id, start_date, end_date)
+        results[name] = (time.perf_counter() - started) * 1000 / samples
+    return results
+
+
+def report(label, path, timings):
+    print(f"{label}: {os.path.getsize(path) / 1e6:.1f} MB")
+    for name, ms in timings.items():
+        print(f"  {name:<14}{ms:>8.2f} ms")
+
+
+def main():
+    app = create_app(BenchmarkConfig)
+    path = BenchmarkConfig.SQLALCHEMY_DATABASE_URI[len("sqlite:///") :]
+    today = date.today()
+
+    with app.app_context():
+        db.create_all()
+        seed(today)
+        report("hot only", path, measure(today))
+
+        started = time.perf_counter()
+        totals = archive_closed_months(add_months(today, -app.config["ARCHIVE_AFTER_MONTHS"]))
+        compact_database()
+        print(
+            f"archived {totals['rows']} rows into {totals['months']} user-months "
+            f"in {time.perf_counter() - started:.1f} s"
+        )
+        report("tiered", path, measure(today))
+
+
+if __name__ == "__main__":
+    main()
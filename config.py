@@ -19,9 +19,75 @@ class Config:
         SQLALCHEMY_DATABASE_URI (str): The URI for the SQLite database.
         SQLALCHEMY_TRACK_MODIFICATIONS (bool): Whether to track modifications to the database models.
         JWT_SECRET_KEY (str): The secret key used for generating JSON Web Tokens.
+        COMPRESS_MIMETYPES (list): Mimetypes eligible for response compression.
+        COMPRESS_MIN_SIZE (int): Smallest response body, in bytes, worth compressing.
+        COMPRESS_GZIP_LEVEL (int): The gzip compression level (1-9).
+        COMPRESS_BROTLI_LEVEL (int): The brotli quality (0-11).
+        PARQUET_ROW_GROUP_SIZE (int): Rows per Parquet row group, bounding export memory.
+        LOCAL_STORE_PATH (str): SQLite file for state shared by all workers on the host.
+        RATE_LIMIT_ENABLED (bool): Whether rate limiting and admission control are applied.
+        RATE_LIMITS (dict): Per-user token buckets as endpoint class -> (capacity, refill seconds).
+        CONCURRENCY_LIMITS (dict): Global cap on concurrent requests per endpoint class.
+        CONCURRENCY_WAIT (float): Seconds a request may wait for a free slot before 503.
+        CONCURRENCY_LEASE (float): Seconds after which a leaked slot is reclaimed.
+        CONCURRENCY_RETRY_AFTER (int): Retry-After seconds sent with a 503.
+        ARCHIVE_AFTER_MONTHS (int): Closed months older than this are packed into the archive tier, at least 1.
+        BATCH_MAX_RANGES (int): The most date ranges accepted by one batch summary request.
+        SLOW_QUERY_LOG (bool): Whether to time every SQL statement and log the slow ones.
+        SLOW_QUERY_THRESHOLD_MS (float): Statements slower than this are logged with their query plan.
+        CHART_IMAGE_MAX_AGE (int): Cache lifetime, in seconds, of versioned chart image responses.
+        CHART_IMAGE_CACHE_PER_USER (int): The most rendered chart images kept per user; the least recently rendered are evicted.
+        ARTIFACT_SIGNING_KEY (str): The HMAC key used to sign artifact download URLs.
+        ARTIFACT_URL_TTL (int): Seconds a signed download URL stays valid (between one and two TTLs).
+        ADMIN_API_KEY (str): The key admin endpoints expect in the X-Admin-Key header, unset disables them.
+        BULK_REGISTER_MAX_USERS (int): The most users accepted by one bulk registration request,
+            sized so their passwords hash well within a worker timeout.
+        BULK_REGISTER_BATCH_SIZE (int): Users inserted per transaction during bulk registration.
+        BULK_HASH_WORKERS (int): Processes the bulk-register command hashes passwords with, defaults to the CPU count.
+        GROUP_SUMMARY_PER_PAGE (int): Members per group summary page when not requested.
+        GROUP_SUMMARY_MAX_PER_PAGE (int): The most members per group summary page.
+        GROUP_SUMMARY_TTL (float): Seconds a group summary page is cached in each worker.
+        GROUP_SUMMARY_CACHE_SIZE (int): The most group summary pages cached in each worker.
     """
 
     SECRET_KEY = os.getenv("FLASK_SECRET_KEY")
     SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(basedir, "app.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    COMPRESS_MIMETYPES = [
+        "application/json",
+        "text/csv",
+        "application/pdf",
+        "image/svg+xml",
+    ]
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 500))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+    COMPRESS_BROTLI_LEVEL = int(os.getenv("COMPRESS_BROTLI_LEVEL", 5))
+    PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", 65536))
+    LOCAL_STORE_PATH = os.getenv("LOCAL_STORE_PATH", os.path.join(basedir, "local_store.db"))
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMITS = {
+        "render": (5, 60),
+        "export": (10, 60),
+        "image": (60, 60),
+    }
+    CONCURRENCY_LIMITS = {"render": int(os.getenv("RENDER_CONCURRENCY_LIMIT", 4))}
+    CONCURRENCY_WAIT = 2.0
+    CONCURRENCY_LEASE = 120.0
+    CONCURRENCY_RETRY_AFTER = 5
+    ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", 6))
+    BATCH_MAX_RANGES = 50
+    SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "false").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 100))
+    CHART_IMAGE_MAX_AGE = 365 * 24 * 3600
+    CHART_IMAGE_CACHE_PER_USER = int(os.getenv("CHART_IMAGE_CACHE_PER_USER", 60))
+    ARTIFACT_SIGNING_KEY = os.getenv("ARTIFACT_SIGNING_KEY") or SECRET_KEY
+    ARTIFACT_URL_TTL = int(os.getenv("ARTIFACT_URL_TTL", 3600))
+    ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+    BULK_REGISTER_MAX_USERS = int(os.getenv("BULK_REGISTER_MAX_USERS", 100))
+    BULK_REGISTER_BATCH_SIZE = 1000
+    BULK_HASH_WORKERS = int(os.getenv("BULK_HASH_WORKERS", 0)) or None
+    GROUP_SUMMARY_PER_PAGE = 50
+    GROUP_SUMMARY_MAX_PER_PAGE = 200
+    GROUP_SUMMARY_TTL = float(os.getenv("GROUP_SUMMARY_TTL", 30))
+    GROUP_SUMMARY_CACHE_SIZE = 1024
@@ -0,0 +1,31 @@
+"""add compressed chart copies
+
+Revision ID: 42d5fe1c6820
+Revises: ba12cfe072dc
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '42d5fe1c6820'
+down_revision = 'ba12cfe072dc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('calorie_charts', sa.Column('pdf_gzip', sa.BLOB(), nullable=True))
+    op.add_column('calorie_charts', sa.Column('pdf_br', sa.BLOB(), nullable=True))
+    op.add_column('calorie_charts', sa.Column('csv_gzip', sa.BLOB(), nullable=True))
+    op.add_column('calorie_charts', sa.Column('csv_br', sa.BLOB(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('calorie_charts') as batch_op:
+        batch_op.drop_column('csv_br')
+        batch_op.drop_column('csv_gzip')
+        batch_op.drop_column('pdf_br')
+        batch_op.drop_column('pdf_gzip')
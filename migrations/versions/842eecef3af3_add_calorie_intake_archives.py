@@ -0,0 +1,37 @@
+"""add calorie intake archives
+
+Revision ID: 842eecef3af3
+Revises: cc432a29ccb1
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '842eecef3af3'
+down_revision = 'cc432a29ccb1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'calorie_intake_archives',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('calories', sa.BLOB(), nullable=False),
+        sa.Column('last_date', sa.Date(), nullable=False),
+        sa.Column('change_seq', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'user_id', 'month', name='uq_calorie_intake_archives_user_month'
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table('calorie_intake_archives')
@@ -0,0 +1,44 @@
+"""add coaching groups
+
+Revision ID: 910deec473cd
+Revises: f3dc4a465bdf
+Create Date: 2026-10-19 10:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '910deec473cd'
+down_revision = 'f3dc4a465bdf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'groups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=120), nullable=False),
+        sa.Column('coach_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['coach_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_groups_coach_id', 'groups', ['coach_id'])
+    op.create_table(
+        'group_members',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['groups.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('group_id', 'user_id', name='uq_group_members_group_user'),
+    )
+
+
+def downgrade():
+    op.drop_table('group_members')
+    op.drop_index('ix_groups_coach_id', table_name='groups')
+    op.drop_table('groups')
@@ -0,0 +1,62 @@
+"""add intake change tracking
+
+Revision ID: cc432a29ccb1
+Revises: dc0ace8dc030
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cc432a29ccb1'
+down_revision = 'dc0ace8dc030'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'change_sequences',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    # SQLite cannot ADD COLUMN with a CURRENT_TIMESTAMP default, so the
+    # table is rebuilt; existing rows get the migration time
+    with op.batch_alter_table('calorie_intakes') as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                'updated_at',
+                sa.DateTime(),
+                server_default=sa.text('CURRENT_TIMESTAMP'),
+                nullable=False,
+            )
+        )
+        batch_op.add_column(
+            sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False)
+        )
+        batch_op.create_index(
+            'ix_calorie_intakes_user_id_change_seq', ['user_id', 'change_seq']
+        )
+        batch_op.create_index('ix_calorie_intakes_user_id_date', ['user_id', 'date'])
+
+    # Existing rows share the first change sequence number, so a client
+    # syncing from watermark 0 still receives them
+    op.execute(
+        "INSERT INTO change_sequences (name, value) "
+        "SELECT 'calorie_intakes', 1 WHERE EXISTS (SELECT 1 FROM calorie_intakes)"
+    )
+    op.execute("UPDATE calorie_intakes SET change_seq = 1")
+
+
+def downgrade():
+    with op.batch_alter_table('calorie_intakes') as batch_op:
+        batch_op.drop_index('ix_calorie_intakes_user_id_date')
+        batch_op.drop_index('ix_calorie_intakes_user_id_change_seq')
+        batch_op.drop_column('change_seq')
+        batch_op.drop_column('updated_at')
+
+    op.drop_table('change_sequences')
@@ -0,0 +1,38 @@
+"""add calorie chart images
+
+Revision ID: d83ad638f65d
+Revises: 842eecef3af3
+Create Date: 2026-10-19 09:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd83ad638f65d'
+down_revision = '842eecef3af3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'calorie_chart_images',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('range_key', sa.String(length=32), nullable=False),
+        sa.Column('size', sa.String(length=16), nullable=False),
+        sa.Column('format', sa.String(length=8), nullable=False),
+        sa.Column('data_version', sa.Integer(), nullable=False),
+        sa.Column('content', sa.BLOB(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'user_id', 'range_key', 'size', 'format', name='uq_calorie_chart_images_key'
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table('calorie_chart_images')
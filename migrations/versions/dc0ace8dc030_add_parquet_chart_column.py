@@ -0,0 +1,25 @@
+"""add parquet chart column
+
+Revision ID: dc0ace8dc030
+Revises: 42d5fe1c6820
+Create Date: 2026-10-19 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dc0ace8dc030'
+down_revision = '42d5fe1c6820'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('calorie_charts', sa.Column('parquet', sa.BLOB(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('calorie_charts') as batch_op:
+        batch_op.drop_column('parquet')
@@ -0,0 +1,53 @@
+"""add chart content versions
+
+Revision ID: f3dc4a465bdf
+Revises: d83ad638f65d
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3dc4a465bdf'
+down_revision = 'd83ad638f65d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('calorie_charts', sa.Column('pdf_version', sa.String(length=16), nullable=True))
+    op.add_column('calorie_charts', sa.Column('csv_version', sa.String(length=16), nullable=True))
+    op.add_column('calorie_charts', sa.Column('parquet_version', sa.String(length=16), nullable=True))
+
+    # Version the files stored before this revision, the same way
+    # content_version() does, so their download links can be signed
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text('SELECT id, pdf, csv, parquet FROM calorie_charts')
+    ).fetchall()
+    for chart_id, pdf, csv, parquet in rows:
+        connection.execute(
+            sa.text(
+                'UPDATE calorie_charts SET pdf_version = :pdf, csv_version = :csv, '
+                'parquet_version = :parquet WHERE id = :id'
+            ),
+            {
+                'id': chart_id,
+                'pdf': hashlib.sha256(pdf).hexdigest()[:16] if pdf is not None else None,
+                'csv': hashlib.sha256(csv).hexdigest()[:16] if csv is not None else None,
+                'parquet': (
+                    hashlib.sha256(parquet).hexdigest()[:16] if parquet is not None else None
+                ),
+            },
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('calorie_charts') as batch_op:
+        batch_op.drop_column('parquet_version')
+        batch_op.drop_column('csv_version')
+        batch_op.drop_column('pdf_version')
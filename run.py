@@ -2,10 +2,13 @@ import sys
 
 sys.dont_write_bytecode = True
 
-from app import create_app, db
+from flask_migrate import upgrade
+
+from app import create_app
 
 app = create_app()
 if __name__ == "__main__":
     with app.app_context():
-        db.create_all()
+        # Migrations, unlike db.create_all(), also add new columns to existing tables
+        upgrade()
     app.run(debug=True)
@@ -0,0 +1,178 @@
+import sys
+
+sys.dont_write_bytecode = True
+
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from app import create_app, db
+from app.utils.archive_utils import archive_closed_months
+from config import Config
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+    LOCAL_STORE_PATH = os.path.join(tempfile.mkdtemp(), "local_store.db")
+    JWT_SECRET_KEY = "test-jwt-secret-key-of-sufficient-length"
+    RATE_LIMIT_ENABLED = False
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def headers(client):
+    client.post(
+        "/auth/register",
+        json={"username": "sync", "email": "sync@example.com", "password": "sync"},
+    )
+    token = client.post(
+        "/auth/login", json={"username_or_email": "sync", "password": "sync"}
+    ).get_json()["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def log_days(client, headers, days, calories=2000):
+    today = date.today()
+    client.post(
+        "/user/intake",
+        json=[
+            {"date": (today - timedelta(days=day)).isoformat(), "calories": calories}
+            for day in days
+        ],
+        headers=headers,
+    )
+
+
+def test_since_includes_archived_rows(client, headers):
+    # Each day is its own write, so the archive keeps many change numbers
+    for day in range(400):
+        log_days(client, headers, [day])
+
+    archive_closed_months(date.today().replace(day=1))
+
+    response = client.get("/user/intake?since=0", headers=headers).get_json()
+    watermark = int(client.get("/user/intake", headers=headers).headers["X-Watermark"])
+
+    assert len({intake["date"] for intake in response["intakes"]}) == 400
+    assert response["watermark"] == watermark
+
+
+def test_since_after_archiving_returns_only_newer_changes(client, headers):
+    log_days(client, headers, range(60, 120))
+    watermark = client.get("/user/intake?since=0", headers=headers).get_json()["watermark"]
+
+    archive_closed_months(date.today().replace(day=1))
+    log_days(client, headers, [0], calories=1500)
+
+    response = client.get(f"/user/intake?since={watermark}", headers=headers).get_json()
+
+    assert response["intakes"] == [
+        {"date": date.today().isoformat(), "calories": 1500}
+    ]
+    assert response["watermark"] > watermark
+
+
+@pytest.mark.parametrize("url", ["/user/intake", "/user/csv"])
+def test_full_read_watermark_never_skips_a_concurrent_write(
+    app, client, headers, monkeypatch, url
+):
+    import app.main.routes as routes
+
+    log_days(client, headers, range(1, 10))
+    concurrent_day = date.today()
+    written = []
+
+    def write_concurrently():
+        # Another request's write, committed on its own connection
+        if not written:
+            written.append(True)
+            with db.engine.begin() as connection:
+                connection.exec_driver_sql(
+                    "UPDATE change_sequences SET value = value + 1 "
+                    "WHERE name = 'calorie_intakes'"
+                )
+                connection.exec_driver_sql(
+                    "INSERT INTO calorie_intakes (user_id, date, calories, change_seq) "
+                    "SELECT 1, ?, 1234, value FROM change_sequences "
+                    "WHERE name = 'calorie_intakes'",
+                    (concurrent_day.isoformat(),),
+                )
+
+    # Commit the write right after whichever of the two reads runs first
+    for name in ("fetch_intakes", "current_watermark"):
+        original = getattr(routes, name)
+
+        def wrapped(*args, original=original, **kwargs):
+            result = original(*args, **kwargs)
+            write_concurrently()
+            return result
+
+        monkeypatch.setattr(routes, name, wrapped)
+
+    response = client.get(url, headers=headers)
+    if url == "/user/intake":
+        received = {intake["date"] for intake in response.get_json()}
+        watermark = int(response.headers["X-Watermark"])
+    else:
+        received = set()
+        watermark = response.get_json()["watermark"]
+
+    delta = client.get(f"/user/intake?since={watermark}", headers=headers).get_json()
+    received |= {intake["date"] for intake in delta["intakes"]}
+
+    assert written
+    assert concurrent_day.isoformat() in received
+
+
+def test_archive_between_tier_reads_does_not_duplicate_days(app, client, headers):
+    from sqlalchemy import event
+
+    from app.utils.intake_utils import fetch_intakes
+
+    log_days(client, headers, range(100, 110))
+    user_id = 1
+    with db.engine.connect() as connection:
+        # WAL lets the archive pass commit while the read transaction is open
+        connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+    archived = []
+
+    def archive_after_hot_read(conn, cursor, statement, *args):
+        if not archived and statement.lstrip().startswith("SELECT calorie_intakes.date"):
+            archived.append(True)
+            thread = threading.Thread(target=archive_in_new_context)
+            thread.start()
+            thread.join()
+
+    def archive_in_new_context():
+        with app.app_context():
+            archive_closed_months(date.today().replace(day=1))
+            db.session.remove()
+
+    event.listen(db.engine, "after_cursor_execute", archive_after_hot_read)
+    try:
+        intakes = fetch_intakes(user_id)
+    finally:
+        event.remove(db.engine, "after_cursor_execute", archive_after_hot_read)
+
+    assert archived
+    assert len(intakes) == len({day for day, _ in intakes}) == 10
+    assert len(fetch_intakes(user_id)) == 10